@@ -5,6 +5,19 @@ from app.pages.signup_page import signup_page
 from app.pages.dashboard_page import index
 from app.states.auth_state import AuthState
 from app.states.settings_state import SettingsState
+from app.states.kanban_state import KanbanState
+from app.states.chat_state import ChatState
+from app.services.archiver import run_task_archiver
+from app.services.presence import run_presence_broadcaster
+from app.services.session_store import run_session_sweeper
+from app.services.user_store import run_password_migration
+from app.services.state_metrics import LOCK_METRICS_ENABLED, run_lock_metrics_reporter
+from app.services.var_profiling import (
+    VAR_PROFILING_ENABLED,
+    VarProfilingMiddleware,
+    debug_api,
+    profile_computed_vars,
+)
 
 app = rxe.App(
     theme=rx.theme(appearance="light"),
@@ -16,11 +29,28 @@ app = rxe.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=debug_api() if VAR_PROFILING_ENABLED else None,
 )
+if VAR_PROFILING_ENABLED:
+    profile_computed_vars()
+    app.add_middleware(VarProfilingMiddleware())
+app.register_lifespan_task(run_task_archiver)
+app.register_lifespan_task(run_presence_broadcaster)
+app.register_lifespan_task(run_session_sweeper)
+app.register_lifespan_task(run_password_migration)
+if LOCK_METRICS_ENABLED:
+    app.register_lifespan_task(run_lock_metrics_reporter, reflex_app=app)
 app.add_page(
     index,
     route="/",
-    on_load=[AuthState.check_session, SettingsState.load_user_settings],
+    on_load=[
+        AuthState.check_session,
+        AuthState.load_user_directory,
+        SettingsState.load_user_settings,
+        KanbanState.load_tasks,
+        ChatState.load_chat,
+        ChatState.start_message_listener,
+    ],
 )
 app.add_page(login_page, route="/login")
 app.add_page(signup_page, route="/signup")
@@ -3,6 +3,21 @@ from app.states.auth_state import AuthState
 from app.states.chat_state import ChatState
 
 
+def contact_meta(summary: dict) -> rx.Component:
+    return rx.el.div(
+        rx.el.span(summary["display_time"], class_name="text-xs text-slate-400"),
+        rx.cond(
+            summary["unread"] > 0,
+            rx.el.span(
+                summary["unread"],
+                class_name="min-w-5 px-1.5 py-0.5 text-xs font-semibold text-white bg-blue-600 rounded-full text-center",
+            ),
+            rx.fragment(),
+        ),
+        class_name="flex flex-col items-end gap-1 shrink-0",
+    )
+
+
 def contact_item(user: dict) -> rx.Component:
     return rx.el.button(
         rx.el.div(
@@ -11,7 +26,7 @@ def contact_item(user: dict) -> rx.Component:
                 class_name="w-10 h-10 rounded-full",
             ),
             rx.cond(
-                user["online"],
+                AuthState.online_users.contains(user["email"]),
                 rx.el.div(
                     class_name="absolute bottom-0 right-0 w-3 h-3 bg-green-500 border-2 border-white rounded-full"
                 ),
@@ -23,8 +38,20 @@ def contact_item(user: dict) -> rx.Component:
         ),
         rx.el.div(
             rx.el.p(user["full_name"], class_name="font-semibold text-slate-800"),
-            rx.el.p(user["department"], class_name="text-sm text-slate-500"),
-            class_name="flex-1 text-left",
+            rx.cond(
+                ChatState.contact_summaries.contains(user["email"]),
+                rx.el.p(
+                    ChatState.contact_summaries[user["email"]]["preview"],
+                    class_name="text-sm text-slate-500 truncate",
+                ),
+                rx.el.p(user["department"], class_name="text-sm text-slate-500"),
+            ),
+            class_name="flex-1 min-w-0 text-left",
+        ),
+        rx.cond(
+            ChatState.contact_summaries.contains(user["email"]),
+            contact_meta(ChatState.contact_summaries[user["email"]]),
+            rx.fragment(),
         ),
         on_click=lambda: ChatState.set_active_chat(user["email"]),
         class_name=rx.cond(
@@ -35,6 +62,22 @@ def contact_item(user: dict) -> rx.Component:
     )
 
 
+def search_hit_item(hit: dict) -> rx.Component:
+    return rx.el.button(
+        rx.el.div(
+            rx.el.p(
+                AuthState.contacts[hit["peer"]]["full_name"],
+                class_name="font-semibold text-slate-800",
+            ),
+            rx.el.span(hit["display_time"], class_name="text-xs text-slate-400"),
+            class_name="flex justify-between items-center",
+        ),
+        rx.el.p(hit["snippet"], class_name="text-sm text-slate-500 line-clamp-2"),
+        on_click=lambda: ChatState.open_search_hit(hit["peer"], hit["id"]),
+        class_name="flex flex-col gap-1 p-3 w-full text-left rounded-lg hover:bg-slate-100 transition-colors duration-200",
+    )
+
+
 def message_bubble(message: dict, is_sender: bool) -> rx.Component:
     return rx.el.div(
         rx.el.div(
@@ -44,8 +87,16 @@ def message_bubble(message: dict, is_sender: bool) -> rx.Component:
                 "bg-blue-600 text-white p-3 rounded-xl max-w-md",
                 "bg-slate-200 text-slate-800 p-3 rounded-xl max-w-md",
             ),
+            style={
+                "outline": rx.cond(
+                    message["id"] == ChatState.highlighted_message_id,
+                    "2px solid #f59e0b",
+                    "none",
+                )
+            },
         ),
-        rx.el.span(message["timestamp"], class_name="text-xs text-slate-400 mt-1"),
+        rx.el.span(message["display_time"], class_name="text-xs text-slate-400 mt-1"),
+        id=f"message-{message['id']}",
         class_name=rx.cond(
             is_sender, "flex flex-col items-end", "flex flex-col items-start"
         ),
@@ -60,12 +111,25 @@ def chat_layout() -> rx.Component:
                 class_name="text-xl font-bold p-4 text-slate-900 border-b border-slate-200",
             ),
             rx.el.div(
-                rx.foreach(
-                    AuthState.users.values(),
-                    lambda user: rx.cond(
-                        user["email"] != AuthState.current_user_email,
-                        contact_item(user),
-                        rx.fragment(),
+                rx.el.input(
+                    placeholder="Search messages...",
+                    default_value=ChatState.search_query,
+                    on_change=ChatState.search_messages.debounce(300),
+                    class_name="w-full px-3 py-2 bg-white border border-slate-200 rounded-lg text-sm focus:outline-none focus:ring-2 focus:ring-blue-500",
+                ),
+                class_name="p-2 border-b border-slate-200",
+            ),
+            rx.el.div(
+                rx.cond(
+                    ChatState.search_query != "",
+                    rx.foreach(ChatState.search_results, search_hit_item),
+                    rx.foreach(
+                        AuthState.contacts.values(),
+                        lambda user: rx.cond(
+                            user["email"] != AuthState.current_user_email,
+                            contact_item(user),
+                            rx.fragment(),
+                        ),
                     ),
                 ),
                 class_name="p-2 space-y-1 overflow-y-auto",
@@ -78,22 +142,40 @@ def chat_layout() -> rx.Component:
                 rx.el.div(
                     rx.el.div(
                         rx.el.h2(
-                            AuthState.users[ChatState.active_chat_with]["full_name"],
+                            AuthState.contacts[ChatState.active_chat_with]["full_name"],
                             class_name="text-lg font-semibold text-slate-900",
                         ),
                         rx.el.p(
-                            AuthState.users[ChatState.active_chat_with]["department"],
+                            AuthState.contacts[ChatState.active_chat_with]["department"],
                             class_name="text-sm text-slate-500",
                         ),
                         class_name="p-4 border-b border-slate-200 bg-slate-50",
                     ),
                     rx.el.div(
+                        rx.cond(
+                            ChatState.has_older_messages,
+                            rx.el.button(
+                                "Load older messages",
+                                on_click=ChatState.load_older_messages,
+                                class_name="w-full py-2 text-sm font-medium text-slate-500 rounded-lg hover:bg-slate-200 hover:text-slate-700 transition-colors duration-200",
+                            ),
+                            rx.fragment(),
+                        ),
                         rx.foreach(
                             ChatState.current_chat_messages,
                             lambda msg: message_bubble(
                                 msg, msg["sender"] == AuthState.current_user_email
                             ),
                         ),
+                        rx.cond(
+                            ChatState.has_newer_messages,
+                            rx.el.button(
+                                "Load newer messages",
+                                on_click=ChatState.load_newer_messages,
+                                class_name="w-full py-2 text-sm font-medium text-slate-500 rounded-lg hover:bg-slate-200 hover:text-slate-700 transition-colors duration-200",
+                            ),
+                            rx.fragment(),
+                        ),
                         class_name="flex-1 p-6 space-y-6 overflow-y-auto",
                     ),
                     rx.el.div(
@@ -52,7 +52,7 @@ def add_task_modal() -> rx.Component:
                         ),
                         rx.el.select(
                             rx.foreach(
-                                AuthState.users.values(),
+                                AuthState.contacts.values(),
                                 lambda user: rx.el.option(
                                     user["full_name"], value=user["email"]
                                 ),
@@ -0,0 +1,49 @@
+import reflex as rx
+from app.states.kanban_state import KanbanState, ArchivedTask
+
+
+def archived_task_item(task: ArchivedTask) -> rx.Component:
+    return rx.el.div(
+        rx.el.div(
+            rx.el.p(task["title"], class_name="font-semibold text-gray-800"),
+            rx.el.p(
+                "Done on ", task["done_at"], class_name="text-xs text-gray-500"
+            ),
+        ),
+        rx.el.button(
+            "Reopen",
+            on_click=lambda: KanbanState.reopen_archived_task(task["id"]),
+            class_name="px-3 py-1 text-sm bg-gray-100 text-gray-700 rounded-lg font-semibold hover:bg-gray-200",
+        ),
+        class_name="flex justify-between items-center p-3 border border-gray-200 rounded-lg",
+    )
+
+
+def archive_modal() -> rx.Component:
+    return rx.el.dialog(
+        rx.el.div(
+            rx.el.div(
+                rx.el.h2("Archive", class_name="text-2xl font-bold text-gray-900"),
+                rx.el.button(
+                    rx.icon("x", class_name="w-5 h-5"),
+                    on_click=KanbanState.toggle_archive_modal,
+                    type="button",
+                    class_name="p-1 rounded-full hover:bg-gray-100",
+                ),
+                class_name="flex justify-between items-center pb-4 mb-6 border-b",
+            ),
+            rx.el.input(
+                placeholder="Search archived tasks...",
+                default_value=KanbanState.archive_query,
+                on_change=KanbanState.search_archive.debounce(300),
+                class_name="w-full px-3 py-2 mb-4 border border-gray-300 rounded-lg shadow-sm focus:outline-none focus:ring-2 focus:ring-blue-500",
+            ),
+            rx.el.div(
+                rx.foreach(KanbanState.archive_results, archived_task_item),
+                class_name="flex flex-col gap-2 max-h-96 overflow-y-auto",
+            ),
+            class_name="bg-white p-8 rounded-2xl shadow-2xl w-full max-w-2xl",
+        ),
+        open=KanbanState.show_archive_modal,
+        class_name="backdrop:bg-black/40 z-50",
+    )
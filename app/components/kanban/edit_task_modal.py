@@ -1,5 +1,5 @@
 import reflex as rx
-from app.states.kanban_state import KanbanState, Task
+from app.states.kanban_state import KanbanState, Task, HistoryLog
 from app.states.auth_state import AuthState
 
 
@@ -24,15 +24,15 @@ def attachment_item(attachment_url: str) -> rx.Component:
 
 
 def comment_item(comment: dict) -> rx.Component:
-    author_user = AuthState.users[comment["author"]]
+    author = AuthState.contacts[comment["author"]]
     return rx.el.div(
         rx.el.img(
-            src=f"https://api.dicebear.com/9.x/initials/svg?seed={author_user['full_name']}",
+            src=f"https://api.dicebear.com/9.x/initials/svg?seed={author['full_name']}",
             class_name="w-8 h-8 rounded-full",
         ),
         rx.el.div(
             rx.el.p(
-                author_user["full_name"],
+                author["full_name"],
                 class_name="font-semibold text-sm text-gray-800",
             ),
             rx.el.p(comment["text"], class_name="text-sm text-gray-600"),
@@ -41,6 +41,15 @@ def comment_item(comment: dict) -> rx.Component:
     )
 
 
+def history_item(log: HistoryLog) -> rx.Component:
+    return rx.el.div(
+        rx.el.p(log["action"], class_name="text-sm text-gray-700"),
+        rx.el.p(
+            log["user"], " · ", log["timestamp"], class_name="text-xs text-gray-400"
+        ),
+    )
+
+
 def edit_task_modal() -> rx.Component:
     return rx.el.dialog(
         rx.cond(
@@ -84,7 +93,7 @@ def edit_task_modal() -> rx.Component:
                             "Assignee",
                             rx.el.select(
                                 rx.foreach(
-                                    AuthState.users.values(),
+                                    AuthState.contacts.values(),
                                     lambda user: rx.el.option(
                                         user["full_name"], value=user["email"]
                                     ),
@@ -180,6 +189,23 @@ def edit_task_modal() -> rx.Component:
                             reset_on_submit=True,
                             class_name="flex flex-col items-end",
                         ),
+                        rx.el.h4(
+                            "History", class_name="font-semibold text-sm mt-6 mb-2"
+                        ),
+                        rx.el.div(
+                            rx.foreach(KanbanState.editing_history, history_item),
+                            class_name="space-y-2 max-h-48 overflow-y-auto",
+                        ),
+                        rx.cond(
+                            KanbanState.has_more_history,
+                            rx.el.button(
+                                "Show older",
+                                type="button",
+                                on_click=KanbanState.load_more_history,
+                                class_name="mt-2 text-sm text-blue-600 hover:underline",
+                            ),
+                            rx.fragment(),
+                        ),
                     ),
                     class_name="w-96 pl-8 border-l ml-8",
                 ),
@@ -5,11 +5,11 @@ from app.states.auth_state import AuthState
 from app.components.kanban.kanban_card import kanban_card
 from app.components.kanban.add_task_modal import add_task_modal
 from app.components.kanban.edit_task_modal import edit_task_modal
+from app.components.kanban.archive_modal import archive_modal
 
 
 @rx.memo
-def kanban_column(title: str, tasks: list) -> rx.Component:
-    count = tasks.length()
+def kanban_column(title: str, tasks: list, count: int) -> rx.Component:
     drop_params = rxe.dnd.DropTarget.collected_params
     return rxe.dnd.drop_target(
         rx.el.div(
@@ -23,6 +23,15 @@ def kanban_column(title: str, tasks: list) -> rx.Component:
             ),
             rx.el.div(
                 rx.foreach(tasks, lambda t: kanban_card(task=t)),
+                rx.cond(
+                    tasks.length() < count,
+                    rx.el.button(
+                        "Load more",
+                        on_click=KanbanState.load_more_cards(title),
+                        class_name="py-2 text-sm font-medium text-slate-500 rounded-lg hover:bg-slate-200 hover:text-slate-700 transition-colors duration-200",
+                    ),
+                    rx.fragment(),
+                ),
                 class_name="p-4 flex flex-col gap-4 h-full overflow-y-auto",
             ),
             class_name=rx.cond(
@@ -46,10 +55,16 @@ def kanban_board_header() -> rx.Component:
             ),
         ),
         rx.el.div(
+            rx.el.input(
+                placeholder="Search tasks...",
+                default_value=KanbanState.search_query,
+                on_change=KanbanState.set_search_query.debounce(300),
+                class_name="bg-white border border-slate-200 rounded-lg px-3 py-2 text-sm text-slate-700 shadow-sm focus:ring-2 focus:ring-blue-500",
+            ),
             rx.el.select(
                 rx.el.option("All Assignees", value="All"),
                 rx.foreach(
-                    AuthState.users.values(),
+                    AuthState.contacts.values(),
                     lambda user: rx.el.option(user["full_name"], value=user["email"]),
                 ),
                 on_change=KanbanState.set_assignee_filter,
@@ -65,6 +80,12 @@ def kanban_board_header() -> rx.Component:
                 default_value=KanbanState.tag_filter,
                 class_name="bg-white border border-slate-200 rounded-lg px-3 py-2 text-sm font-medium text-slate-700 shadow-sm focus:ring-2 focus:ring-blue-500",
             ),
+            rx.el.button(
+                rx.icon("archive", class_name="w-5 h-5 mr-2"),
+                "Archive",
+                on_click=KanbanState.toggle_archive_modal,
+                class_name="flex items-center px-4 py-2 bg-white border border-slate-200 text-slate-700 rounded-lg font-semibold hover:bg-slate-50 transition-all duration-200 shadow-sm",
+            ),
             rx.el.button(
                 rx.icon("plus", class_name="w-5 h-5 mr-2"),
                 "Add Task",
@@ -81,15 +102,25 @@ def kanban_board() -> rx.Component:
     return rx.el.div(
         kanban_board_header(),
         rx.el.div(
-            rx.foreach(
-                KanbanState.columns,
-                lambda col: kanban_column(
-                    title=col, tasks=KanbanState.tasks_by_column[col]
-                ),
+            kanban_column(
+                title="To Do",
+                tasks=KanbanState.todo_cards,
+                count=KanbanState.column_counts["To Do"],
+            ),
+            kanban_column(
+                title="In Progress",
+                tasks=KanbanState.in_progress_cards,
+                count=KanbanState.column_counts["In Progress"],
+            ),
+            kanban_column(
+                title="Done",
+                tasks=KanbanState.done_cards,
+                count=KanbanState.column_counts["Done"],
             ),
             class_name="flex gap-6 p-8 overflow-x-auto",
         ),
         add_task_modal(),
         edit_task_modal(),
+        archive_modal(),
         class_name="flex flex-col h-full",
     )
\ No newline at end of file
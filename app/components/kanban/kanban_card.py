@@ -1,7 +1,6 @@
 import reflex as rx
 import reflex_enterprise as rxe
-from app.states.kanban_state import KanbanState, Task
-from app.states.auth_state import AuthState
+from app.states.kanban_state import KanbanState, TaskCard
 
 
 def tag_component(tag: str, color: str) -> rx.Component:
@@ -24,8 +23,7 @@ def priority_indicator(priority: rx.Var[str]) -> rx.Component:
 
 
 @rx.memo
-def kanban_card(task: Task) -> rx.Component:
-    assignee_user = AuthState.users[task["assignee"]]
+def kanban_card(task: TaskCard) -> rx.Component:
     draggable_params = rxe.dnd.Draggable.collected_params
     return rxe.dnd.draggable(
         rx.el.div(
@@ -63,7 +61,7 @@ def kanban_card(task: Task) -> rx.Component:
                     rx.el.div(
                         rx.icon("paperclip", class_name="w-4 h-4 text-gray-500"),
                         rx.el.span(
-                            task["attachments"].length(),
+                            task["attachment_count"],
                             class_name="text-xs font-medium",
                         ),
                         class_name="flex items-center gap-1 text-gray-500",
@@ -71,7 +69,7 @@ def kanban_card(task: Task) -> rx.Component:
                     rx.el.div(
                         rx.icon("message-square", class_name="w-4 h-4 text-gray-500"),
                         rx.el.span(
-                            task["comments"].length(), class_name="text-xs font-medium"
+                            task["comment_count"], class_name="text-xs font-medium"
                         ),
                         class_name="flex items-center gap-1 text-gray-500",
                     ),
@@ -79,14 +77,15 @@ def kanban_card(task: Task) -> rx.Component:
                 ),
                 rx.el.div(
                     rx.el.img(
-                        src=f"https://api.dicebear.com/9.x/initials/svg?seed={assignee_user['full_name']}",
+                        src=f"https://api.dicebear.com/9.x/initials/svg?seed={task['assignee_name']}",
                         class_name="w-6 h-6 rounded-full border-2 border-white",
-                        title=assignee_user["full_name"],
+                        title=task["assignee_name"],
                     )
                 ),
                 class_name="flex justify-between items-center mt-4",
             ),
             on_click=lambda: KanbanState.open_edit_task_modal(task["id"]),
+            style={"content_visibility": "auto", "contain_intrinsic_size": "auto 9rem"},
             class_name="bg-white p-4 rounded-xl border border-gray-200 shadow-sm hover:shadow-md hover:-translate-y-1 transition-all duration-200 cursor-pointer",
         ),
         type="task",
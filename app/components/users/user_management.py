@@ -1,5 +1,5 @@
 import reflex as rx
-from app.states.auth_state import AuthState, User
+from app.states.auth_state import AuthState, UserProfile, USER_PAGE_SIZES
 from app.components.users.user_modal import user_modal
 
 
@@ -19,7 +19,8 @@ def user_management_header() -> rx.Component:
                 rx.icon("search", class_name="w-5 h-5 text-slate-400"),
                 rx.el.input(
                     placeholder="Pesquisar por nome ou e-mail...",
-                    on_change=AuthState.set_search_query,
+                    default_value=AuthState.search_query,
+                    on_change=AuthState.set_search_query.debounce(300),
                     class_name="bg-transparent focus:ring-0 border-none w-full placeholder-slate-400 text-sm",
                 ),
                 class_name="flex items-center gap-2 bg-white border border-slate-200 rounded-lg px-3 py-2 w-full max-w-xs shadow-sm",
@@ -45,7 +46,7 @@ def user_management_header() -> rx.Component:
     )
 
 
-def user_table_row(user: User) -> rx.Component:
+def user_table_row(user: UserProfile) -> rx.Component:
     return rx.el.tr(
         rx.el.td(
             rx.el.div(
@@ -80,12 +81,14 @@ def user_table_row(user: User) -> rx.Component:
             rx.el.div(
                 rx.el.div(
                     class_name=rx.cond(
-                        user["online"],
+                        AuthState.online_users.contains(user["email"]),
                         "h-2.5 w-2.5 rounded-full bg-green-500 mr-2",
                         "h-2.5 w-2.5 rounded-full bg-gray-400 mr-2",
                     )
                 ),
-                rx.cond(user["online"], "Online", "Offline"),
+                rx.cond(
+                    AuthState.online_users.contains(user["email"]), "Online", "Offline"
+                ),
                 class_name="flex items-center text-sm text-gray-600",
             ),
             class_name="px-6 py-4 whitespace-nowrap",
@@ -110,32 +113,75 @@ def user_table_row(user: User) -> rx.Component:
     )
 
 
+def sortable_header(label: str, column: str) -> rx.Component:
+    return rx.el.th(
+        rx.el.button(
+            label,
+            rx.cond(
+                AuthState.user_sort == column,
+                rx.cond(
+                    AuthState.user_sort_desc,
+                    rx.icon("chevron-down", class_name="w-3 h-3"),
+                    rx.icon("chevron-up", class_name="w-3 h-3"),
+                ),
+                rx.fragment(),
+            ),
+            on_click=AuthState.set_user_sort(column),
+            class_name="flex items-center gap-1 uppercase tracking-wider hover:text-slate-700",
+        ),
+        scope="col",
+        class_name="px-6 py-3 text-left text-xs font-bold text-slate-500",
+    )
+
+
+def user_table_pagination() -> rx.Component:
+    return rx.el.div(
+        rx.el.p(
+            AuthState.user_total,
+            " usuários · Página ",
+            AuthState.user_page + 1,
+            " de ",
+            AuthState.user_page_count,
+            class_name="text-sm text-slate-500",
+        ),
+        rx.el.div(
+            rx.el.select(
+                *[
+                    rx.el.option(f"{size} por página", value=str(size))
+                    for size in USER_PAGE_SIZES
+                ],
+                default_value=AuthState.user_page_size.to_string(),
+                on_change=AuthState.set_user_page_size,
+                class_name="bg-white border border-slate-200 rounded-lg px-3 py-2 text-sm font-medium text-slate-700 shadow-sm focus:ring-2 focus:ring-blue-500",
+            ),
+            rx.el.button(
+                rx.icon("chevron-left", class_name="w-4 h-4"),
+                on_click=AuthState.set_user_page(AuthState.user_page - 1),
+                disabled=AuthState.user_page == 0,
+                class_name="p-2 bg-white border border-slate-200 rounded-lg shadow-sm hover:bg-slate-50 disabled:opacity-50",
+            ),
+            rx.el.button(
+                rx.icon("chevron-right", class_name="w-4 h-4"),
+                on_click=AuthState.set_user_page(AuthState.user_page + 1),
+                disabled=AuthState.user_page + 1 >= AuthState.user_page_count,
+                class_name="p-2 bg-white border border-slate-200 rounded-lg shadow-sm hover:bg-slate-50 disabled:opacity-50",
+            ),
+            class_name="flex items-center gap-2",
+        ),
+        class_name="flex justify-between items-center py-4",
+    )
+
+
 def user_table() -> rx.Component:
     return rx.el.div(
         rx.el.div(
             rx.el.table(
                 rx.el.thead(
                     rx.el.tr(
-                        rx.el.th(
-                            "Nome",
-                            scope="col",
-                            class_name="px-6 py-3 text-left text-xs font-bold text-slate-500 uppercase tracking-wider",
-                        ),
-                        rx.el.th(
-                            "Departamento",
-                            scope="col",
-                            class_name="px-6 py-3 text-left text-xs font-bold text-slate-500 uppercase tracking-wider",
-                        ),
-                        rx.el.th(
-                            "Função",
-                            scope="col",
-                            class_name="px-6 py-3 text-left text-xs font-bold text-slate-500 uppercase tracking-wider",
-                        ),
-                        rx.el.th(
-                            "Status",
-                            scope="col",
-                            class_name="px-6 py-3 text-left text-xs font-bold text-slate-500 uppercase tracking-wider",
-                        ),
+                        sortable_header("Nome", "name"),
+                        sortable_header("Departamento", "department"),
+                        sortable_header("Função", "role"),
+                        sortable_header("Status", "online"),
                         rx.el.th(scope="col", class_name="relative px-6 py-3"),
                     )
                 ),
@@ -147,6 +193,7 @@ def user_table() -> rx.Component:
             ),
             class_name="-my-2 overflow-x-auto sm:-mx-6 lg:-mx-8",
         ),
+        user_table_pagination(),
         class_name="flex flex-col px-8",
     )
 
@@ -1,5 +1,7 @@
 import reflex as rx
 from app.states.base_state import BaseState
+from app.states.identity_state import IdentityState
+from app.services.presence import HEARTBEAT_INTERVAL_SECONDS
 from app.components.sidebar import sidebar
 from app.components.kanban.kanban_board import kanban_board
 from app.components.chat.chat_layout import chat_layout
@@ -9,6 +11,11 @@ from app.components.settings.settings_page import settings_page
 
 def index() -> rx.Component:
     return rx.el.div(
+        rx.moment(
+            interval=HEARTBEAT_INTERVAL_SECONDS * 1000,
+            on_change=IdentityState.presence_heartbeat,
+            display="none",
+        ),
         sidebar(),
         rx.el.main(
             rx.match(
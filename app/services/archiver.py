@@ -0,0 +1,23 @@
+import asyncio
+import logging
+import os
+
+from app.services.task_store import ARCHIVE_BATCH_SIZE, task_store
+
+ARCHIVE_INTERVAL_SECONDS = int(os.environ.get("TASK_ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+logger = logging.getLogger(__name__)
+
+
+async def run_task_archiver():
+    while True:
+        try:
+            while True:
+                archived = await asyncio.to_thread(task_store.archive_done_tasks)
+                if archived:
+                    logger.info("Archived %d done tasks", len(archived))
+                if len(archived) < ARCHIVE_BATCH_SIZE:
+                    break
+        except Exception:
+            logger.exception("Task archival failed")
+        await asyncio.sleep(ARCHIVE_INTERVAL_SECONDS)
@@ -0,0 +1,293 @@
+import datetime
+import sqlite3
+
+from app.services.clock import now_ms
+from app.services.database import ConnectionPool, database, fts_match_expression
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    receiver TEXT NOT NULL,
+    text TEXT NOT NULL,
+    timestamp INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages (conversation, id);
+CREATE TABLE IF NOT EXISTS conversation_state (
+    owner TEXT NOT NULL,
+    peer TEXT NOT NULL,
+    unread INTEGER NOT NULL DEFAULT 0,
+    last_message_id INTEGER NOT NULL,
+    last_sender TEXT NOT NULL,
+    last_text TEXT NOT NULL,
+    last_timestamp INTEGER NOT NULL,
+    PRIMARY KEY (owner, peer)
+);
+-- The participants column holds the hex-encoded sender and receiver, one
+-- opaque token each, so a search can MATCH on them instead of filtering
+-- after every user's messages have been ranked.
+CREATE VIEW IF NOT EXISTS message_search_source AS
+    SELECT id, text, hex(sender) || ' ' || hex(receiver) AS participants
+    FROM messages;
+CREATE VIRTUAL TABLE IF NOT EXISTS message_search USING fts5(
+    text,
+    participants,
+    content = 'message_search_source',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS message_search_insert AFTER INSERT ON messages BEGIN
+    INSERT INTO message_search (rowid, text, participants)
+    VALUES (new.id, new.text, hex(new.sender) || ' ' || hex(new.receiver));
+END;
+CREATE TRIGGER IF NOT EXISTS message_search_delete AFTER DELETE ON messages BEGIN
+    INSERT INTO message_search (message_search, rowid, text, participants)
+    VALUES ('delete', old.id, old.text, hex(old.sender) || ' ' || hex(old.receiver));
+END;
+"""
+
+MESSAGE_PAGE_SIZE = 30
+LAST_MESSAGE_PREVIEW_LENGTH = 80
+SEARCH_RESULT_LIMIT = 50
+
+SEED_MESSAGES = [
+    {
+        "sender": "jane.doe@example.com",
+        "receiver": "admin@example.com",
+        "text": "Hey, can you review the latest designs for the landing page?",
+        "timestamp": "10:30 AM",
+    },
+    {
+        "sender": "admin@example.com",
+        "receiver": "jane.doe@example.com",
+        "text": "Sure, send them over. I'll take a look this afternoon.",
+        "timestamp": "10:31 AM",
+    },
+    {
+        "sender": "jane.doe@example.com",
+        "receiver": "admin@example.com",
+        "text": "Great, thanks! I've attached the Figma link to the Kanban card.",
+        "timestamp": "10:31 AM",
+    },
+    {
+        "sender": "john.smith@example.com",
+        "receiver": "admin@example.com",
+        "text": "Morning! Just wanted to confirm our marketing sync for 2 PM.",
+        "timestamp": "11:00 AM",
+    },
+]
+
+
+def conversation_key(first_email: str, second_email: str) -> str:
+    return "|".join(sorted((first_email, second_email)))
+
+
+def _legacy_timestamp_ms(clock_time: str) -> int:
+    """Pin an old ``10:30 AM`` style timestamp to today, in UTC."""
+    try:
+        parsed = datetime.datetime.strptime(clock_time, "%I:%M %p").time()
+    except ValueError:
+        return now_ms()
+    moment = datetime.datetime.combine(
+        datetime.datetime.now(datetime.timezone.utc).date(),
+        parsed,
+        tzinfo=datetime.timezone.utc,
+    )
+    return int(moment.timestamp() * 1000)
+
+
+def _insert_message(conn: sqlite3.Connection, message: dict) -> int:
+    cursor = conn.execute(
+        "INSERT INTO messages (conversation, sender, receiver, text, timestamp)"
+        " VALUES (?, ?, ?, ?, ?)",
+        (
+            conversation_key(message["sender"], message["receiver"]),
+            message["sender"],
+            message["receiver"],
+            message["text"],
+            message["timestamp"],
+        ),
+    )
+    _record_last_message(conn, cursor.lastrowid, message)
+    return cursor.lastrowid
+
+
+def _record_last_message(conn: sqlite3.Connection, message_id: int, message: dict):
+    """Bump the receiver's unread counter and refresh both sides' snapshot.
+
+    Sending into a conversation counts as having read it, so the sender's
+    counter is cleared.
+    """
+    sides = [(message["receiver"], message["sender"], 1)]
+    if message["sender"] != message["receiver"]:
+        sides.append((message["sender"], message["receiver"], 0))
+    preview = message["text"][:LAST_MESSAGE_PREVIEW_LENGTH]
+    conn.executemany(
+        "INSERT INTO conversation_state"
+        " (owner, peer, unread, last_message_id, last_sender, last_text,"
+        " last_timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT (owner, peer) DO UPDATE SET"
+        " unread = CASE WHEN excluded.unread = 0 THEN 0 ELSE unread + 1 END,"
+        " last_message_id = excluded.last_message_id,"
+        " last_sender = excluded.last_sender,"
+        " last_text = excluded.last_text,"
+        " last_timestamp = excluded.last_timestamp",
+        [
+            (
+                owner,
+                peer,
+                unread,
+                message_id,
+                message["sender"],
+                preview,
+                message["timestamp"],
+            )
+            for owner, peer, unread in sides
+        ],
+    )
+
+
+def _backfill_conversation_state(conn: sqlite3.Connection):
+    if conn.execute("SELECT 1 FROM conversation_state LIMIT 1").fetchone():
+        return
+    latest = "SELECT MAX(id) FROM messages GROUP BY conversation"
+    for owner, peer in (("receiver", "sender"), ("sender", "receiver")):
+        conn.execute(
+            "INSERT OR IGNORE INTO conversation_state"
+            " (owner, peer, unread, last_message_id, last_sender, last_text,"
+            f" last_timestamp) SELECT {owner}, {peer}, 0, id, sender,"
+            f" substr(text, 1, {LAST_MESSAGE_PREVIEW_LENGTH}), timestamp"
+            f" FROM messages WHERE id IN ({latest})"
+        )
+
+
+def _participant_token(email: str) -> str:
+    """The token ``hex()`` writes to the participants column for ``email``."""
+    return email.encode().hex().upper()
+
+
+def _backfill_search_index(conn: sqlite3.Connection):
+    # messages_fts indexed the text alone; message_search replaces it.
+    conn.execute("DROP TRIGGER IF EXISTS messages_fts_insert")
+    conn.execute("DROP TRIGGER IF EXISTS messages_fts_delete")
+    conn.execute("DROP TABLE IF EXISTS messages_fts")
+    if conn.execute("SELECT 1 FROM message_search_docsize LIMIT 1").fetchone():
+        return
+    if conn.execute("SELECT 1 FROM messages LIMIT 1").fetchone():
+        conn.execute("INSERT INTO message_search (message_search) VALUES ('rebuild')")
+
+
+def _migrate_and_seed_messages(conn: sqlite3.Connection):
+    legacy = conn.execute(
+        "SELECT id, timestamp FROM messages WHERE timestamp GLOB '*[^0-9]*'"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE messages SET timestamp = ? WHERE id = ?",
+        [(_legacy_timestamp_ms(row["timestamp"]), row["id"]) for row in legacy],
+    )
+    _backfill_conversation_state(conn)
+    _backfill_search_index(conn)
+    if conn.execute("SELECT 1 FROM messages LIMIT 1").fetchone():
+        return
+    for message in SEED_MESSAGES:
+        _insert_message(
+            conn,
+            {**message, "timestamp": _legacy_timestamp_ms(message["timestamp"])},
+        )
+
+
+class ChatStore:
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        pool.register_schema(SCHEMA, seed=_migrate_and_seed_messages)
+
+    def list_messages(
+        self,
+        first_email: str,
+        second_email: str,
+        before_id: int | None = None,
+        after_id: int | None = None,
+        limit: int = MESSAGE_PAGE_SIZE,
+    ) -> list[dict]:
+        """Page through a conversation in id order.
+
+        Without a cursor this returns the newest ``limit`` messages; ``before_id``
+        pages backwards and ``after_id`` pages forwards from a message.
+        """
+        query = (
+            "SELECT id, sender, receiver, text, CAST(timestamp AS INTEGER)"
+            " AS timestamp FROM messages WHERE conversation = ?"
+        )
+        params: list = [conversation_key(first_email, second_email)]
+        if after_id is not None:
+            query += " AND id > ? ORDER BY id LIMIT ?"
+            params += [after_id, limit]
+        elif before_id is not None:
+            query += " AND id < ? ORDER BY id DESC LIMIT ?"
+            params += [before_id, limit]
+        else:
+            query += " ORDER BY id DESC LIMIT ?"
+            params.append(limit)
+        with self.pool.connection() as conn:
+            rows = [dict(row) for row in conn.execute(query, params).fetchall()]
+        return rows if after_id is not None else rows[::-1]
+
+    def add_message(self, sender: str, receiver: str, text: str) -> dict:
+        """Store a message stamped with the current UTC time in epoch millis."""
+        message = {
+            "sender": sender,
+            "receiver": receiver,
+            "text": text,
+            "timestamp": now_ms(),
+        }
+        with self.pool.transaction() as conn:
+            message_id = _insert_message(conn, message)
+        return {"id": message_id, **message}
+
+    def list_conversations(self, owner: str) -> list[dict]:
+        """Unread count and last-message snapshot for each of ``owner``'s peers."""
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT peer, unread, last_sender, last_text, last_timestamp"
+                " FROM conversation_state WHERE owner = ?",
+                (owner,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def search_messages(
+        self, email: str, query: str, limit: int = SEARCH_RESULT_LIMIT
+    ) -> list[dict]:
+        """Rank the messages ``email`` sent or received against ``query``."""
+        expression = fts_match_expression(query)
+        if not expression:
+            return []
+        participant = _participant_token(email)
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT m.id, m.sender, m.receiver,"
+                " snippet(message_search, 0, '', '', '…', 16) AS snippet,"
+                " CAST(m.timestamp AS INTEGER) AS timestamp"
+                " FROM message_search JOIN messages m ON m.id = message_search.rowid"
+                " WHERE message_search MATCH ?"
+                " ORDER BY bm25(message_search, 1.0, 0.0) LIMIT ?",
+                (f'text : ({expression}) AND participants : "{participant}"', limit),
+            ).fetchall()
+        return [
+            {
+                **dict(row),
+                "peer": row["receiver"] if row["sender"] == email else row["sender"],
+            }
+            for row in rows
+        ]
+
+    def mark_read(self, owner: str, peer: str):
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "UPDATE conversation_state SET unread = 0"
+                " WHERE owner = ? AND peer = ? AND unread > 0",
+                (owner, peer),
+            )
+
+
+chat_store = ChatStore(database)
@@ -0,0 +1,29 @@
+import datetime
+import re
+import time
+
+DEFAULT_TIMEZONE = "(GMT-03:00) Brasilía"
+
+_OFFSET_PATTERN = re.compile(r"GMT([+-])(\d{2}):(\d{2})")
+
+
+def now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def utc_offset(timezone_label: str) -> datetime.timezone:
+    """Turn a label like ``(GMT-03:00) Brasilía`` into a fixed-offset tzinfo."""
+    match = _OFFSET_PATTERN.search(timezone_label or "")
+    if not match:
+        return datetime.timezone.utc
+    sign, hours, minutes = match.groups()
+    offset = datetime.timedelta(hours=int(hours), minutes=int(minutes))
+    return datetime.timezone(-offset if sign == "-" else offset)
+
+
+def format_message_time(epoch_ms: int, timezone_label: str) -> str:
+    tz = utc_offset(timezone_label)
+    moment = datetime.datetime.fromtimestamp(epoch_ms / 1000, tz)
+    if moment.date() == datetime.datetime.now(tz).date():
+        return moment.strftime("%I:%M %p")
+    return moment.strftime("%d %b, %I:%M %p")
@@ -0,0 +1,129 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+DATABASE_PATH = os.environ.get("CHAT_KANBAN_DB", "chat_kanban.db")
+POOL_SIZE = int(os.environ.get("CHAT_KANBAN_DB_POOL_SIZE", "8"))
+BUSY_TIMEOUT_MS = 5000
+
+SchemaSeed = Callable[[sqlite3.Connection], None]
+
+
+class ConnectionPool:
+    def __init__(self, path: str, size: int = POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._initialized = False
+        self._schemas: list[tuple[str, SchemaSeed | None]] = []
+
+    def register_schema(self, script: str, seed: SchemaSeed | None = None):
+        with self._lock:
+            self._schemas.append((script, seed))
+            initialized = self._initialized
+        if initialized:
+            with self.connection() as conn:
+                self._apply_schema(conn, script, seed)
+
+    def _apply_schema(
+        self,
+        conn: sqlite3.Connection,
+        script: str,
+        seed: SchemaSeed | None,
+    ):
+        conn.executescript(script)
+        if seed is None:
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            seed(conn)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                conn = self._open()
+                if not self._initialized:
+                    self._initialized = True
+                    for script, seed in self._schemas:
+                        self._apply_schema(conn, script, seed)
+                return conn
+        return self._idle.get()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._idle.put(conn)
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def close(self):
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._opened = 0
+            self._initialized = False
+
+
+def ensure_column(conn: sqlite3.Connection, table: str, column: str, definition: str):
+    columns = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+def fts_match_expression(query: str) -> str:
+    """Quote each word so user input is never parsed as FTS5 syntax.
+
+    The last word is matched as a prefix so results show up while typing.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+    if terms:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+database = ConnectionPool(DATABASE_PATH)
@@ -0,0 +1,80 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.services.message_bus import message_bus
+from app.services.presence import HEARTBEAT_INTERVAL_SECONDS, presence
+
+# How often an idle listener checks that its tab is still heartbeating.
+LIVENESS_CHECK_SECONDS = HEARTBEAT_INTERVAL_SECONDS
+
+
+class ListenerRegistry:
+    """The background listeners this worker is running, one per tab and kind.
+
+    This lives in process memory, not in state: a flag in state survives a
+    backend restart that killed the task it describes, while this registry
+    starts empty and lets the next page load start the listener again. A
+    listener stops once its tab stops heartbeating (see ``PresenceService``),
+    signs out, or a newer listener claims the same tab.
+    """
+
+    def __init__(self):
+        self._owners: dict[tuple[str, str], str] = {}
+
+    def claim(self, kind: str, client_token: str, email: str) -> bool:
+        """Record a listener for this tab; False if one is already running."""
+        key = (kind, client_token)
+        if self._owners.get(key) == email:
+            return False
+        self._owners[key] = email
+        return True
+
+    def is_running(self, kind: str, client_token: str, email: str) -> bool:
+        return self._owners.get((kind, client_token)) == email
+
+    async def _while_alive(
+        self,
+        kind: str,
+        client_token: str,
+        email: str,
+        messages: AsyncIterator[dict],
+        pending: set[asyncio.Future],
+    ) -> AsyncIterator[dict]:
+        while self.is_running(kind, client_token, email):
+            if not pending:
+                pending.add(asyncio.ensure_future(anext(messages)))
+            done, _ = await asyncio.wait(pending, timeout=LIVENESS_CHECK_SECONDS)
+            if not done:
+                if not await asyncio.to_thread(
+                    presence.is_connected, email, client_token
+                ):
+                    return
+                continue
+            pending.clear()
+            try:
+                message = done.pop().result()
+            except StopAsyncIteration:
+                return
+            if self.is_running(kind, client_token, email):
+                yield message
+
+    @asynccontextmanager
+    async def listen(
+        self, kind: str, client_token: str, email: str, channel: str
+    ) -> AsyncIterator[AsyncIterator[dict]]:
+        """Subscribe to ``channel`` for as long as this listener is current."""
+        pending: set[asyncio.Future] = set()
+        async with message_bus.subscribe(channel) as messages:
+            try:
+                yield self._while_alive(
+                    kind, client_token, email, aiter(messages), pending
+                )
+            finally:
+                for future in pending:
+                    future.cancel()
+                if self.is_running(kind, client_token, email):
+                    del self._owners[(kind, client_token)]
+
+
+listeners = ListenerRegistry()
@@ -0,0 +1,83 @@
+import asyncio
+import json
+import os
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+MESSAGE_BUS_URL = os.environ.get("CHAT_MESSAGE_BUS_URL", "memory://")
+
+
+def user_channel(email: str) -> str:
+    return f"user:{email}"
+
+
+class InProcessMessageBus:
+    def __init__(self):
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    async def publish(self, channel: str, payload: dict):
+        for queue in list(self._subscribers.get(channel, ())):
+            queue.put_nowait(payload)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[AsyncIterator[dict]]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[channel].add(queue)
+
+        async def messages():
+            while True:
+                yield await queue.get()
+
+        try:
+            yield messages()
+        finally:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+
+class RedisMessageBus:
+    def __init__(self, client: Any):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisMessageBus":
+        try:
+            import redis.asyncio as redis
+        except ImportError as err:
+            raise RuntimeError(
+                "CHAT_MESSAGE_BUS_URL points at Redis but the 'redis' package is not"
+                " installed."
+            ) from err
+        return cls(redis.Redis.from_url(url))
+
+    async def publish(self, channel: str, payload: dict):
+        await self.client.publish(channel, json.dumps(payload))
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[AsyncIterator[dict]]:
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(channel)
+
+        async def messages():
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield json.loads(message["data"])
+
+        try:
+            yield messages()
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+
+
+def create_message_bus(url: str) -> InProcessMessageBus | RedisMessageBus:
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisMessageBus.from_url(url)
+    return InProcessMessageBus()
+
+
+message_bus = create_message_bus(MESSAGE_BUS_URL)
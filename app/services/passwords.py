@@ -0,0 +1,89 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+
+# scrypt cost parameters. Raising any of them makes existing hashes
+# "stale"; they are upgraded transparently the next time the user signs in.
+SCRYPT_N = int(os.environ.get("PASSWORD_SCRYPT_N", str(2**14)))
+SCRYPT_R = int(os.environ.get("PASSWORD_SCRYPT_R", "8"))
+SCRYPT_P = int(os.environ.get("PASSWORD_SCRYPT_P", "1"))
+HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "4"))
+
+SALT_BYTES = 16
+KEY_BYTES = 32
+SCHEME = "scrypt"
+
+# hashlib.scrypt releases the GIL, so a small dedicated pool gives real
+# parallelism without starving the default executor used elsewhere.
+_executor = ThreadPoolExecutor(
+    max_workers=HASH_WORKERS, thread_name_prefix="password-hash"
+)
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def _derive(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    return hashlib.scrypt(
+        password.encode(),
+        salt=salt,
+        n=n,
+        r=r,
+        p=p,
+        maxmem=128 * n * r * (p + 1) + 1024 * 1024,
+        dklen=KEY_BYTES,
+    )
+
+
+def hash_password(
+    password: str, n: int | None = None, r: int | None = None, p: int | None = None
+) -> str:
+    """Return ``scrypt$n$r$p$salt$key`` for storage."""
+    n, r, p = n or SCRYPT_N, r or SCRYPT_R, p or SCRYPT_P
+    salt = secrets.token_bytes(SALT_BYTES)
+    key = _derive(password, salt, n, r, p)
+    return f"{SCHEME}${n}${r}${p}${_b64(salt)}${_b64(key)}"
+
+
+def _parse(stored: str) -> tuple[int, int, int, bytes, bytes] | None:
+    parts = stored.split("$")
+    if len(parts) != 6 or parts[0] != SCHEME:
+        return None
+    try:
+        n, r, p = (int(part) for part in parts[1:4])
+        return n, r, p, base64.b64decode(parts[4]), base64.b64decode(parts[5])
+    except ValueError:
+        return None
+
+
+def is_hashed(stored: str) -> bool:
+    return _parse(stored) is not None
+
+
+def verify_password(password: str, stored: str) -> bool:
+    parsed = _parse(stored)
+    if parsed is None:
+        # Rows written before hashing was introduced hold the plain password.
+        return hmac.compare_digest(password.encode(), stored.encode())
+    n, r, p, salt, key = parsed
+    return hmac.compare_digest(_derive(password, salt, n, r, p), key)
+
+
+def needs_rehash(stored: str) -> bool:
+    parsed = _parse(stored)
+    return parsed is None or parsed[:3] != (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+async def hash_password_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, hash_password, password)
+
+
+async def verify_password_async(password: str, stored: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, verify_password, password, stored)
@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+
+from app.services.database import ConnectionPool, database
+from app.services.message_bus import message_bus
+
+PRESENCE_TTL_SECONDS = int(os.environ.get("PRESENCE_TTL_SECONDS", "60"))
+HEARTBEAT_INTERVAL_SECONDS = int(os.environ.get("PRESENCE_HEARTBEAT_SECONDS", "20"))
+BROADCAST_INTERVAL_MS = int(os.environ.get("PRESENCE_BROADCAST_MS", "500"))
+PRESENCE_CHANNEL = "presence"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS presence (
+    email TEXT NOT NULL,
+    connection_id TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (email, connection_id)
+);
+CREATE INDEX IF NOT EXISTS idx_presence_expires_at ON presence (expires_at);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class PresenceService:
+    """Who is online, derived from per-connection heartbeats with a TTL.
+
+    Heartbeats and disconnects are only buffered here. The broadcaster task
+    writes them in one transaction per tick, drops expired connections, and
+    publishes the resulting online/offline diff. A burst of sign-ins at 9 AM
+    therefore costs one write and one message per tick, not one per login.
+    The table lives in the shared database, so every worker sees the same
+    online set.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        pool.register_schema(SCHEMA)
+        self._heartbeats: dict[tuple[str, str], float] = {}
+        self._disconnects: set[tuple[str, str]] = set()
+        self._online: set[str] = set()
+
+    def heartbeat(self, email: str, connection_id: str):
+        key = (email, connection_id)
+        self._disconnects.discard(key)
+        self._heartbeats[key] = time.time() + PRESENCE_TTL_SECONDS
+
+    def disconnect(self, email: str, connection_id: str):
+        key = (email, connection_id)
+        self._heartbeats.pop(key, None)
+        self._disconnects.add(key)
+
+    def online_users(self) -> set[str]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT DISTINCT email FROM presence WHERE expires_at > ?",
+                (time.time(),),
+            ).fetchall()
+        return {row["email"] for row in rows} | {
+            email for email, _ in self._heartbeats
+        }
+
+    def is_connected(self, email: str, connection_id: str) -> bool:
+        """Whether this connection has heartbeated within the TTL."""
+        key = (email, connection_id)
+        if key in self._heartbeats:
+            return True
+        if key in self._disconnects:
+            return False
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM presence"
+                " WHERE email = ? AND connection_id = ? AND expires_at > ?",
+                (email, connection_id, time.time()),
+            ).fetchone()
+        return row is not None
+
+    def _drain(self) -> tuple[dict[tuple[str, str], float], set[tuple[str, str]]]:
+        heartbeats, self._heartbeats = self._heartbeats, {}
+        disconnects, self._disconnects = self._disconnects, set()
+        return heartbeats, disconnects
+
+    def _write(
+        self,
+        heartbeats: dict[tuple[str, str], float],
+        disconnects: set[tuple[str, str]],
+    ) -> tuple[set[str], set[str]]:
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO presence (email, connection_id, expires_at)"
+                " VALUES (?, ?, ?) ON CONFLICT (email, connection_id)"
+                " DO UPDATE SET expires_at = excluded.expires_at",
+                [(*key, expires_at) for key, expires_at in heartbeats.items()],
+            )
+            conn.executemany(
+                "DELETE FROM presence WHERE email = ? AND connection_id = ?",
+                list(disconnects),
+            )
+            conn.execute("DELETE FROM presence WHERE expires_at <= ?", (time.time(),))
+            online = _online_emails(conn)
+        previous, self._online = self._online, online
+        return online - previous, previous - online
+
+    async def flush(self) -> tuple[set[str], set[str]]:
+        """Persist buffered changes; return who came online and who went offline."""
+        heartbeats, disconnects = self._drain()
+        return await asyncio.to_thread(self._write, heartbeats, disconnects)
+
+
+def _online_emails(conn: sqlite3.Connection) -> set[str]:
+    return {row["email"] for row in conn.execute("SELECT DISTINCT email FROM presence")}
+
+
+presence = PresenceService(database)
+
+
+async def run_presence_broadcaster():
+    while True:
+        try:
+            came_online, went_offline = await presence.flush()
+            if came_online or went_offline:
+                await message_bus.publish(
+                    PRESENCE_CHANNEL,
+                    {"online": sorted(came_online), "offline": sorted(went_offline)},
+                )
+        except Exception:
+            logger.exception("Presence flush failed")
+        await asyncio.sleep(BROADCAST_INTERVAL_MS / 1000)
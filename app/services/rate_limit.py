@@ -0,0 +1,142 @@
+import math
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+RATE_LIMIT_URL = os.environ.get("LOGIN_RATE_LIMIT_URL", "memory://")
+MAX_TRACKED_KEYS = int(os.environ.get("LOGIN_RATE_LIMIT_MAX_KEYS", "100000"))
+
+
+@dataclass(frozen=True)
+class TokenBucket:
+    capacity: int
+    refill_per_second: float
+
+    @property
+    def ttl(self) -> float:
+        """Seconds after which an idle bucket is full again and can be dropped."""
+        return self.capacity / self.refill_per_second
+
+
+# Five guesses per account, then one more every minute.
+ACCOUNT_LOGIN_BUCKET = TokenBucket(
+    capacity=int(os.environ.get("LOGIN_ACCOUNT_BURST", "5")),
+    refill_per_second=float(os.environ.get("LOGIN_ACCOUNT_PER_MINUTE", "1")) / 60,
+)
+# A client (IP) may spread attempts over many accounts, but not quickly.
+CLIENT_LOGIN_BUCKET = TokenBucket(
+    capacity=int(os.environ.get("LOGIN_CLIENT_BURST", "20")),
+    refill_per_second=float(os.environ.get("LOGIN_CLIENT_PER_MINUTE", "10")) / 60,
+)
+
+
+class InProcessRateLimiter:
+    """Token buckets in a dict ordered by last use.
+
+    Buckets that have been idle long enough to refill completely carry no
+    information, so they are evicted from the front as new keys arrive. The
+    table is also capped at ``max_keys`` so a flood of spoofed keys cannot grow
+    it without bound.
+    """
+
+    def __init__(self, max_keys: int = MAX_TRACKED_KEYS):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float, float]] = OrderedDict()
+
+    def _evict(self, now: float):
+        while self._buckets:
+            key, (_, updated_at, ttl) = next(iter(self._buckets.items()))
+            if len(self._buckets) < self.max_keys and now - updated_at < ttl:
+                break
+            del self._buckets[key]
+
+    async def consume(self, key: str, bucket: TokenBucket, cost: int = 1) -> float:
+        """Take ``cost`` tokens; return 0 on success or seconds until allowed."""
+        now = time.monotonic()
+        self._evict(now)
+        tokens, updated_at, _ = self._buckets.pop(
+            key, (float(bucket.capacity), now, bucket.ttl)
+        )
+        tokens = min(
+            bucket.capacity, tokens + (now - updated_at) * bucket.refill_per_second
+        )
+        retry_after = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / bucket.refill_per_second
+        self._buckets[key] = (tokens, now, bucket.ttl)
+        return retry_after
+
+    async def reset(self, key: str):
+        self._buckets.pop(key, None)
+
+
+# KEYS[1] = bucket key; ARGV = capacity, refill per ms, cost, ttl ms.
+# Uses the server clock so every worker agrees on elapsed time.
+_CONSUME_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local now = redis.call('TIME')
+now = now[1] * 1000 + math.floor(now[2] / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated_at) * rate)
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', now)
+redis.call('PEXPIRE', KEYS[1], ARGV[4])
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimiter:
+    """Token buckets shared by every worker, updated atomically by a script."""
+
+    def __init__(self, client: Any, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self._consume = client.register_script(_CONSUME_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimiter":
+        try:
+            import redis.asyncio as redis
+        except ImportError as err:
+            raise RuntimeError(
+                "LOGIN_RATE_LIMIT_URL points at Redis but the 'redis' package is not"
+                " installed."
+            ) from err
+        return cls(redis.Redis.from_url(url))
+
+    async def consume(self, key: str, bucket: TokenBucket, cost: int = 1) -> float:
+        retry_after_ms = await self._consume(
+            keys=[self.prefix + key],
+            args=[
+                bucket.capacity,
+                bucket.refill_per_second / 1000,
+                cost,
+                math.ceil(bucket.ttl * 1000),
+            ],
+        )
+        return float(retry_after_ms) / 1000
+
+    async def reset(self, key: str):
+        await self.client.delete(self.prefix + key)
+
+
+def create_rate_limiter(url: str) -> InProcessRateLimiter | RedisRateLimiter:
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisRateLimiter.from_url(url)
+    return InProcessRateLimiter()
+
+
+rate_limiter = create_rate_limiter(RATE_LIMIT_URL)
@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import os
+import secrets
+import sqlite3
+import time
+from collections import OrderedDict
+
+from app.services.database import ConnectionPool, database
+
+DEFAULT_SESSION_HOURS = 24
+CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", "10000"))
+# How long a worker trusts a cached session before re-reading it, which also
+# bounds how long a session revoked on another worker stays usable here.
+CACHE_TTL_SECONDS = int(os.environ.get("SESSION_CACHE_TTL_SECONDS", "60"))
+SWEEP_INTERVAL_SECONDS = int(os.environ.get("SESSION_SWEEP_INTERVAL_SECONDS", "300"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    token TEXT PRIMARY KEY,
+    email TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions (expires_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_email ON sessions (email);
+CREATE TABLE IF NOT EXISTS app_settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def _seed_settings(conn: sqlite3.Connection):
+    conn.execute(
+        "INSERT OR IGNORE INTO app_settings (key, value) VALUES (?, ?)",
+        ("session_expiration_hours", str(DEFAULT_SESSION_HOURS)),
+    )
+
+
+class SessionStore:
+    """Sign-in sessions keyed by an opaque token kept in a browser cookie.
+
+    The table is the source of truth, so any worker can resolve any token.
+    Each worker keeps a bounded LRU of recently resolved tokens in front of
+    it; ``resolve`` on a warm token touches no database at all.
+    """
+
+    def __init__(self, pool: ConnectionPool, cache_size: int = CACHE_SIZE):
+        self.pool = pool
+        self.cache_size = cache_size
+        # token -> (email, expires_at, cached_until)
+        self._cache: OrderedDict[str, tuple[str, float, float]] = OrderedDict()
+        pool.register_schema(SCHEMA, seed=_seed_settings)
+
+    def lifetime_hours(self) -> int:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT value FROM app_settings WHERE key = 'session_expiration_hours'"
+            ).fetchone()
+        return int(row["value"]) if row else DEFAULT_SESSION_HOURS
+
+    def set_lifetime_hours(self, hours: int):
+        """Change the lifetime of new sessions and cap existing ones to it."""
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "INSERT INTO app_settings (key, value)"
+                " VALUES ('session_expiration_hours', ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (str(hours),),
+            )
+            conn.execute(
+                "UPDATE sessions SET expires_at = MIN(expires_at, created_at + ?)",
+                (hours * 3600,),
+            )
+        self._cache.clear()
+
+    def _remember(self, token: str, email: str, expires_at: float, now: float):
+        self._cache[token] = (email, expires_at, now + CACHE_TTL_SECONDS)
+        self._cache.move_to_end(token)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def create(self, email: str) -> str:
+        token = secrets.token_urlsafe(32)
+        now = time.time()
+        expires_at = now + self.lifetime_hours() * 3600
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "INSERT INTO sessions (token, email, created_at, last_seen, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (token, email, now, now, expires_at),
+            )
+        self._remember(token, email, expires_at, now)
+        return token
+
+    def resolve(self, token: str) -> str | None:
+        """Return the signed-in email for ``token``, or None if it is not valid.
+
+        ``last_seen`` is only written when the cached entry is refreshed, at
+        most once per ``CACHE_TTL_SECONDS`` per worker.
+        """
+        if not token:
+            return None
+        now = time.time()
+        cached = self._cache.get(token)
+        if cached is not None:
+            email, expires_at, cached_until = cached
+            if now < cached_until and now < expires_at:
+                self._cache.move_to_end(token)
+                return email
+            del self._cache[token]
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "UPDATE sessions SET last_seen = ? WHERE token = ? AND expires_at > ?",
+                (now, token, now),
+            )
+            row = conn.execute(
+                "SELECT email, expires_at FROM sessions"
+                " WHERE token = ? AND expires_at > ?",
+                (token, now),
+            ).fetchone()
+        if row is None:
+            return None
+        self._remember(token, row["email"], row["expires_at"], now)
+        return row["email"]
+
+    def revoke(self, token: str):
+        self._cache.pop(token, None)
+        with self.pool.transaction() as conn:
+            conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+    def revoke_user(self, email: str):
+        for token in [t for t, entry in self._cache.items() if entry[0] == email]:
+            del self._cache[token]
+        with self.pool.transaction() as conn:
+            conn.execute("DELETE FROM sessions WHERE email = ?", (email,))
+
+    def _delete_expired(self, now: float) -> int:
+        with self.pool.transaction() as conn:
+            cursor = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+        return cursor.rowcount
+
+    async def sweep(self) -> int:
+        """Drop expired sessions from the table and this worker's cache."""
+        now = time.time()
+        for token in [t for t, entry in self._cache.items() if entry[1] <= now]:
+            del self._cache[token]
+        return await asyncio.to_thread(self._delete_expired, now)
+
+
+session_store = SessionStore(database)
+
+
+async def run_session_sweeper():
+    while True:
+        try:
+            swept = await session_store.sweep()
+            if swept:
+                logger.info("Expired %d sessions", swept)
+        except Exception:
+            logger.exception("Session sweep failed")
+        await asyncio.sleep(SWEEP_INTERVAL_SECONDS)
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+LOCK_METRICS_ENABLED = os.environ.get("STATE_LOCK_METRICS", "") == "1"
+LOCK_METRICS_INTERVAL_SECONDS = int(
+    os.environ.get("STATE_LOCK_METRICS_INTERVAL_SECONDS", "60")
+)
+# An acquire slower than this is counted as having waited on another holder.
+CONTENDED_MS = float(os.environ.get("STATE_LOCK_CONTENDED_MS", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LockStats:
+    acquisitions: int = 0
+    contended: int = 0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    hold_seconds: float = 0.0
+    max_hold_seconds: float = 0.0
+    waits: list[float] = field(default_factory=list)
+
+
+class LockMetrics:
+    """Per-state counters for the state manager's modify_state lock.
+
+    ``wait`` runs from asking for a state to getting it back, so it covers the
+    lock wait plus loading the state; ``hold`` is the time the event kept the
+    lock, including writing the state back. Counters are cumulative.
+    """
+
+    def __init__(self, keep_samples: bool = False):
+        self.keep_samples = keep_samples
+        self._stats: dict[str, LockStats] = {}
+
+    def record(self, state: str, wait: float, hold: float):
+        stats = self._stats.setdefault(state, LockStats())
+        stats.acquisitions += 1
+        stats.contended += wait * 1000 >= CONTENDED_MS
+        stats.wait_seconds += wait
+        stats.max_wait_seconds = max(stats.max_wait_seconds, wait)
+        stats.hold_seconds += hold
+        stats.max_hold_seconds = max(stats.max_hold_seconds, hold)
+        if self.keep_samples:
+            stats.waits.append(wait)
+
+    def snapshot(self) -> dict[str, LockStats]:
+        return dict(self._stats)
+
+    def reset(self):
+        self._stats.clear()
+
+
+lock_metrics = LockMetrics()
+
+
+def _state_name(token: str) -> str:
+    # Reflex keys states as "<client token>_<state path>".
+    return token.partition("_")[2] or "root"
+
+
+def instrument_state_manager(manager: Any, metrics: LockMetrics = lock_metrics):
+    """Time every ``modify_state`` on ``manager`` into ``metrics``."""
+    modify_state = manager.modify_state
+
+    @asynccontextmanager
+    async def timed_modify_state(token: str, *args, **kwargs):
+        requested = time.perf_counter()
+        async with modify_state(token, *args, **kwargs) as state:
+            acquired = time.perf_counter()
+            try:
+                yield state
+            finally:
+                released = time.perf_counter()
+                metrics.record(
+                    _state_name(token), acquired - requested, released - acquired
+                )
+
+    manager.modify_state = timed_modify_state
+    return manager
+
+
+async def run_lock_metrics_reporter(reflex_app: Any):
+    instrument_state_manager(reflex_app.state_manager)
+    while True:
+        await asyncio.sleep(LOCK_METRICS_INTERVAL_SECONDS)
+        for state, stats in sorted(lock_metrics.snapshot().items()):
+            logger.info(
+                "state lock %s: %d acquisitions, %d contended,"
+                " wait avg %.1f ms max %.1f ms, hold avg %.1f ms max %.1f ms",
+                state,
+                stats.acquisitions,
+                stats.contended,
+                stats.wait_seconds / stats.acquisitions * 1000,
+                stats.max_wait_seconds * 1000,
+                stats.hold_seconds / stats.acquisitions * 1000,
+                stats.max_hold_seconds * 1000,
+            )
@@ -0,0 +1,711 @@
+import datetime
+import json
+import os
+import sqlite3
+import zlib
+
+from app.services.database import (
+    ConnectionPool,
+    database,
+    ensure_column,
+    fts_match_expression,
+)
+
+ARCHIVE_AFTER_DAYS = int(os.environ.get("TASK_ARCHIVE_AFTER_DAYS", "30"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    assignee TEXT NOT NULL,
+    due_date TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    attachments TEXT NOT NULL DEFAULT '[]',
+    done_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks (assignee);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date);
+
+CREATE TABLE IF NOT EXISTS task_tags (
+    task_id INTEGER NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (task_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_task_tags_tag ON task_tags (tag);
+
+CREATE TABLE IF NOT EXISTS task_comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL REFERENCES tasks (id) ON DELETE CASCADE,
+    author TEXT NOT NULL,
+    text TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_task_comments_task ON task_comments (task_id, id);
+
+CREATE TABLE IF NOT EXISTS task_history_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL,
+    user TEXT NOT NULL,
+    action TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_task_history_log_task
+    ON task_history_log (task_id, timestamp, id);
+CREATE TRIGGER IF NOT EXISTS task_history_log_no_update
+    BEFORE UPDATE ON task_history_log
+    BEGIN SELECT RAISE(ABORT, 'task history is append-only'); END;
+CREATE TRIGGER IF NOT EXISTS task_history_log_no_delete
+    BEFORE DELETE ON task_history_log
+    BEGIN SELECT RAISE(ABORT, 'task history is append-only'); END;
+
+CREATE TABLE IF NOT EXISTS archived_tasks (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    assignee TEXT NOT NULL,
+    done_at TEXT NOT NULL,
+    archived_at TEXT NOT NULL,
+    search_text TEXT NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_archived_tasks_done_at ON archived_tasks (done_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS archive_search USING fts5(
+    search_text,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+-- Archiving uses INSERT OR REPLACE, whose implicit delete fires no trigger,
+-- so the insert trigger clears any previous row itself.
+CREATE TRIGGER IF NOT EXISTS archive_search_insert AFTER INSERT ON archived_tasks
+BEGIN
+    DELETE FROM archive_search WHERE rowid = new.id;
+    INSERT INTO archive_search (rowid, search_text) VALUES (new.id, new.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS archive_search_delete AFTER DELETE ON archived_tasks
+BEGIN
+    DELETE FROM archive_search WHERE rowid = old.id;
+END;
+
+-- Running totals kept by the triggers below, so the unfiltered board and
+-- the tag list are read without scanning tasks or task_tags.
+CREATE TABLE IF NOT EXISTS task_status_counts (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS task_tag_counts (
+    tag TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS task_search USING fts5(
+    title,
+    description,
+    tags,
+    comments,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_REINDEX_TASK = """
+    DELETE FROM task_search WHERE rowid = {task_id};
+    INSERT INTO task_search (rowid, title, description, tags, comments)
+    SELECT id, title, description,
+        (SELECT group_concat(tag, ' ') FROM task_tags WHERE task_id = tasks.id),
+        (SELECT group_concat(text, ' ') FROM task_comments WHERE task_id = tasks.id)
+    FROM tasks WHERE id = {task_id};
+"""
+
+# Every write that changes a task's searchable text re-derives its row, so
+# create, update, comment, duplicate, archive and restore all stay in sync.
+SCHEMA += "".join(
+    f"CREATE TRIGGER IF NOT EXISTS task_search_{name} AFTER {event} BEGIN"
+    f"{_REINDEX_TASK.format(task_id=task_id)}END;\n"
+    for name, event, task_id in (
+        ("task_insert", "INSERT ON tasks", "new.id"),
+        ("task_update", "UPDATE OF title, description ON tasks", "new.id"),
+        ("task_delete", "DELETE ON tasks", "old.id"),
+        ("tag_insert", "INSERT ON task_tags", "new.task_id"),
+        ("tag_delete", "DELETE ON task_tags", "old.task_id"),
+        ("comment_insert", "INSERT ON task_comments", "new.task_id"),
+        ("comment_delete", "DELETE ON task_comments", "old.task_id"),
+    )
+)
+
+_COUNT = """
+    INSERT INTO {table} ({key}, count) VALUES ({value}, {delta})
+        ON CONFLICT ({key}) DO UPDATE SET count = count + {delta};
+    DELETE FROM {table} WHERE {key} = {value} AND count <= 0;
+"""
+
+
+def _count_status(value: str, delta: int) -> str:
+    return _COUNT.format(
+        table="task_status_counts", key="status", value=value, delta=delta
+    )
+
+
+def _count_tag(value: str, delta: int) -> str:
+    return _COUNT.format(table="task_tag_counts", key="tag", value=value, delta=delta)
+
+
+# Cascaded deletes fire these too, so archiving and deleting a task also
+# drop its tags from the totals.
+SCHEMA += "".join(
+    f"CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} BEGIN{body}END;\n"
+    for name, event, body in (
+        ("status_count_insert", "INSERT ON tasks", _count_status("new.status", 1)),
+        ("status_count_delete", "DELETE ON tasks", _count_status("old.status", -1)),
+        (
+            "status_count_update",
+            "UPDATE OF status ON tasks WHEN old.status IS NOT new.status",
+            _count_status("old.status", -1) + _count_status("new.status", 1),
+        ),
+        ("tag_count_insert", "INSERT ON task_tags", _count_tag("new.tag", 1)),
+        ("tag_count_delete", "DELETE ON task_tags", _count_tag("old.tag", -1)),
+    )
+)
+
+SEED_TASKS = [
+    {
+        "title": "Design new landing page",
+        "description": "Create mockups and wireframes for the new V2 landing page.",
+        "assignee": "jane.doe@example.com",
+        "due_date": "2024-08-15",
+        "tags": ["UI/UX", "High Priority"],
+        "status": "In Progress",
+        "priority": "High",
+        "attachments": ["/placeholder.svg"],
+        "comments": [
+            {
+                "author": "admin@example.com",
+                "text": "Let's use a blue color scheme.",
+                "timestamp": "2024-08-01 10:00",
+            }
+        ],
+        "history": [
+            {
+                "user": "admin@example.com",
+                "action": "Created task",
+                "timestamp": "2024-07-30 09:00",
+            }
+        ],
+    },
+    {
+        "title": "Develop authentication flow",
+        "description": "Implement JWT-based authentication for the backend API.",
+        "assignee": "jane.doe@example.com",
+        "due_date": "2024-08-20",
+        "tags": ["Backend", "Security"],
+        "status": "In Progress",
+        "priority": "High",
+        "attachments": [],
+        "comments": [],
+        "history": [],
+    },
+    {
+        "title": "Setup CI/CD pipeline",
+        "description": "Configure GitHub Actions for automated testing and deployment.",
+        "assignee": "admin@example.com",
+        "due_date": "2024-08-10",
+        "tags": ["DevOps"],
+        "status": "Done",
+        "priority": "Medium",
+        "attachments": [],
+        "comments": [],
+        "history": [],
+    },
+    {
+        "title": "Write API documentation",
+        "description": "Use Swagger/OpenAPI to document all API endpoints.",
+        "assignee": "john.smith@example.com",
+        "due_date": "2024-08-25",
+        "tags": ["Documentation"],
+        "status": "To Do",
+        "priority": "Medium",
+        "attachments": [],
+        "comments": [],
+        "history": [],
+    },
+    {
+        "title": "Plan Q4 marketing campaign",
+        "description": "Outline strategy, budget, and KPIs for the upcoming quarter.",
+        "assignee": "john.smith@example.com",
+        "due_date": "2024-09-01",
+        "tags": ["Marketing", "Strategy"],
+        "status": "To Do",
+        "priority": "Low",
+        "attachments": [],
+        "comments": [],
+        "history": [],
+    },
+]
+
+TASK_FIELDS = ("title", "description", "assignee", "due_date", "status", "priority")
+DESCRIPTION_PREVIEW_LENGTH = 140
+CARD_PAGE_SIZE = 25
+QUERY_BATCH_SIZE = 500
+HISTORY_PAGE_SIZE = 20
+ARCHIVE_BATCH_SIZE = 500
+
+
+def _preview(description: str) -> str:
+    if len(description) <= DESCRIPTION_PREVIEW_LENGTH:
+        return description
+    return description[:DESCRIPTION_PREVIEW_LENGTH].rstrip() + "…"
+
+
+def _now() -> str:
+    return datetime.datetime.now().isoformat()
+
+
+def _board_filter(
+    assignee: str | None = None, tag: str | None = None, query: str = ""
+) -> tuple[list[str], list]:
+    """WHERE clauses narrowing the board to one assignee, tag and search."""
+    clauses, params = [], []
+    if assignee:
+        clauses.append("assignee = ?")
+        params.append(assignee)
+    if tag:
+        clauses.append("id IN (SELECT task_id FROM task_tags WHERE tag = ?)")
+        params.append(tag)
+    if expression := fts_match_expression(query):
+        clauses.append(
+            "id IN (SELECT rowid FROM task_search WHERE task_search MATCH ?)"
+        )
+        params.append(expression)
+    return clauses, params
+
+
+def _task_exists(conn: sqlite3.Connection, task_id: int) -> bool:
+    row = conn.execute("SELECT 1 FROM tasks WHERE id = ?", (task_id,)).fetchone()
+    return row is not None
+
+
+def _insert_task(conn: sqlite3.Connection, task: dict) -> int:
+    cursor = conn.execute(
+        "INSERT INTO tasks (id, title, description, assignee, due_date, status,"
+        " priority, attachments, done_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            task.get("id"),
+            task["title"],
+            task["description"],
+            task["assignee"],
+            task["due_date"],
+            task["status"],
+            task["priority"],
+            json.dumps(task.get("attachments", [])),
+            _now() if task["status"] == "Done" else None,
+        ),
+    )
+    task_id = cursor.lastrowid
+    _write_tags(conn, task_id, task.get("tags", []))
+    return task_id
+
+
+def _write_tags(conn: sqlite3.Connection, task_id: int, tags: list[str]):
+    conn.execute("DELETE FROM task_tags WHERE task_id = ?", (task_id,))
+    conn.executemany(
+        "INSERT INTO task_tags (task_id, position, tag) VALUES (?, ?, ?)",
+        [(task_id, position, tag) for position, tag in enumerate(tags)],
+    )
+
+
+def _insert_comments(conn: sqlite3.Connection, task_id: int, comments: list[dict]):
+    conn.executemany(
+        "INSERT INTO task_comments (task_id, author, text, timestamp)"
+        " VALUES (?, ?, ?, ?)",
+        [(task_id, c["author"], c["text"], c["timestamp"]) for c in comments],
+    )
+
+
+def _insert_history(conn: sqlite3.Connection, task_id: int, history: list[dict]):
+    conn.executemany(
+        "INSERT INTO task_history_log (task_id, user, action, timestamp)"
+        " VALUES (?, ?, ?, ?)",
+        [(task_id, h["user"], h["action"], h["timestamp"]) for h in history],
+    )
+
+
+def _migrate_and_seed_tasks(conn: sqlite3.Connection):
+    ensure_column(conn, "tasks", "done_at", "TEXT")
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_status_done_at ON tasks (status, done_at)"
+    )
+    conn.execute(
+        "UPDATE tasks SET done_at = ? WHERE status = 'Done' AND done_at IS NULL",
+        (_now(),),
+    )
+    if conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'task_history'"
+    ).fetchone():
+        conn.execute(
+            "INSERT INTO task_history_log (task_id, user, action, timestamp)"
+            " SELECT task_id, user, action, timestamp FROM task_history ORDER BY id"
+        )
+        conn.execute("DROP TABLE task_history")
+    if not conn.execute("SELECT 1 FROM task_search LIMIT 1").fetchone():
+        conn.execute(
+            "INSERT INTO task_search (rowid, title, description, tags, comments)"
+            " SELECT id, title, description,"
+            " (SELECT group_concat(tag, ' ') FROM task_tags WHERE task_id = tasks.id),"
+            " (SELECT group_concat(text, ' ') FROM task_comments"
+            " WHERE task_id = tasks.id) FROM tasks"
+        )
+    if not conn.execute("SELECT 1 FROM task_status_counts LIMIT 1").fetchone():
+        conn.execute(
+            "INSERT INTO task_status_counts (status, count)"
+            " SELECT status, count(*) FROM tasks GROUP BY status"
+        )
+    if not conn.execute("SELECT 1 FROM task_tag_counts LIMIT 1").fetchone():
+        conn.execute(
+            "INSERT INTO task_tag_counts (tag, count)"
+            " SELECT tag, count(*) FROM task_tags GROUP BY tag"
+        )
+    if not conn.execute("SELECT 1 FROM archive_search LIMIT 1").fetchone():
+        conn.execute(
+            "INSERT INTO archive_search (rowid, search_text)"
+            " SELECT id, search_text FROM archived_tasks"
+        )
+    if conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone():
+        return
+    for task in SEED_TASKS:
+        task_id = _insert_task(conn, task)
+        _insert_comments(conn, task_id, task["comments"])
+        _insert_history(conn, task_id, task["history"])
+
+
+class TaskStore:
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        pool.register_schema(SCHEMA, seed=_migrate_and_seed_tasks)
+
+    def _load_tags(self, conn: sqlite3.Connection, tasks: dict[int, dict]):
+        ids = list(tasks)
+        for start in range(0, len(ids), QUERY_BATCH_SIZE):
+            batch = ids[start : start + QUERY_BATCH_SIZE]
+            for row in conn.execute(
+                "SELECT task_id, tag FROM task_tags"
+                f" WHERE task_id IN ({','.join('?' * len(batch))})"
+                " ORDER BY task_id, position",
+                batch,
+            ):
+                tasks[row["task_id"]]["tags"].append(row["tag"])
+
+    def _hydrate(self, conn: sqlite3.Connection, rows: list[sqlite3.Row]) -> list[dict]:
+        if not rows:
+            return []
+        tasks = {
+            row["id"]: {
+                "id": row["id"],
+                "title": row["title"],
+                "description": row["description"],
+                "assignee": row["assignee"],
+                "due_date": row["due_date"],
+                "tags": [],
+                "status": row["status"],
+                "priority": row["priority"],
+                "attachments": json.loads(row["attachments"]),
+                "comments": [],
+            }
+            for row in rows
+        }
+        self._load_tags(conn, tasks)
+        placeholders = ",".join("?" * len(tasks))
+        ids = list(tasks)
+        for row in conn.execute(
+            "SELECT task_id, author, text, timestamp FROM task_comments"
+            f" WHERE task_id IN ({placeholders}) ORDER BY id",
+            ids,
+        ):
+            tasks[row["task_id"]]["comments"].append(
+                {
+                    "author": row["author"],
+                    "text": row["text"],
+                    "timestamp": row["timestamp"],
+                }
+            )
+        return list(tasks.values())
+
+    def _summaries(self, conn: sqlite3.Connection, where: list[str], params: list):
+        rows = conn.execute(
+            "SELECT id, title, description, assignee, due_date, status, priority,"
+            " json_array_length(attachments) AS attachment_count,"
+            " (SELECT count(*) FROM task_comments c WHERE c.task_id = tasks.id)"
+            f" AS comment_count FROM tasks WHERE {' AND '.join(where)}"
+            " ORDER BY id LIMIT ?",
+            params,
+        ).fetchall()
+        if not rows:
+            return []
+        tasks = {
+            row["id"]: {
+                "id": row["id"],
+                "title": row["title"],
+                "description": _preview(row["description"]),
+                "assignee": row["assignee"],
+                "due_date": row["due_date"],
+                "tags": [],
+                "status": row["status"],
+                "priority": row["priority"],
+                "attachment_count": row["attachment_count"],
+                "comment_count": row["comment_count"],
+            }
+            for row in rows
+        }
+        self._load_tags(conn, tasks)
+        return list(tasks.values())
+
+    def list_task_summaries(
+        self,
+        status: str,
+        after_id: int = 0,
+        limit: int = CARD_PAGE_SIZE,
+        **filters,
+    ) -> list[dict]:
+        """Card summaries of one column, in id order, after ``after_id``."""
+        clauses, params = _board_filter(**filters)
+        with self.pool.connection() as conn:
+            return self._summaries(
+                conn,
+                ["status = ?", "id > ?", *clauses],
+                [status, after_id, *params, limit],
+            )
+
+    def load_columns(
+        self, limits: dict[str, int], **filters
+    ) -> tuple[dict[str, int], dict[str, list[dict]]]:
+        """Per-status counts and the first ``limits[status]`` cards of each column.
+
+        ``filters`` are ``assignee``, ``tag`` and a search ``query``; each
+        narrows the board through an index, so the cost follows the window
+        sizes rather than the size of the board. The unfiltered board reads
+        its counts from the trigger-maintained totals.
+        """
+        clauses, params = _board_filter(**filters)
+        if clauses:
+            count_query = (
+                "SELECT status, count(*) AS count FROM tasks"
+                f" WHERE {' AND '.join(clauses)} GROUP BY status"
+            )
+        else:
+            count_query = "SELECT status, count FROM task_status_counts"
+        with self.pool.connection() as conn:
+            counts = {
+                row["status"]: row["count"]
+                for row in conn.execute(count_query, params)
+            }
+            windows = {
+                status: self._summaries(
+                    conn, ["status = ?", *clauses], [status, *params, limit]
+                )
+                for status, limit in limits.items()
+            }
+        return counts, windows
+
+    def list_tags(self) -> list[str]:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT tag FROM task_tag_counts ORDER BY tag"
+            ).fetchall()
+        return [row["tag"] for row in rows]
+
+    def count_open_due(self, due_date: str) -> int:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT count(*) AS count FROM tasks"
+                " WHERE due_date = ? AND status != 'Done'",
+                (due_date,),
+            ).fetchone()
+        return row["count"]
+
+    def get_task(self, task_id: int) -> dict | None:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT * FROM tasks WHERE id = ?", (task_id,)
+            ).fetchall()
+            tasks = self._hydrate(conn, rows)
+        return tasks[0] if tasks else None
+
+    def create_task(self, task: dict) -> dict:
+        with self.pool.transaction() as conn:
+            task_id = _insert_task(conn, task)
+        return self.get_task(task_id)
+
+    def update_task(self, task_id: int, fields: dict) -> dict | None:
+        columns = [name for name in TASK_FIELDS if name in fields]
+        with self.pool.transaction() as conn:
+            if not _task_exists(conn, task_id):
+                return None
+            if columns:
+                conn.execute(
+                    f"UPDATE tasks SET {', '.join(f'{name} = ?' for name in columns)}"
+                    " WHERE id = ?",
+                    [fields[name] for name in columns] + [task_id],
+                )
+            if "tags" in fields:
+                _write_tags(conn, task_id, fields["tags"])
+        return self.get_task(task_id)
+
+    def set_status(self, task_id: int, status: str) -> str | None:
+        """Move a task; return its previous status, or None if it is gone."""
+        with self.pool.transaction() as conn:
+            row = conn.execute(
+                "SELECT status FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row["status"] != status:
+                conn.execute(
+                    "UPDATE tasks SET status = ?, done_at = ? WHERE id = ?",
+                    (status, _now() if status == "Done" else None, task_id),
+                )
+        return row["status"]
+
+    def delete_task(self, task_id: int):
+        with self.pool.transaction() as conn:
+            conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def duplicate_task(self, task_id: int, title: str) -> dict | None:
+        with self.pool.transaction() as conn:
+            original = self._hydrate(
+                conn,
+                conn.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchall(),
+            )
+            if not original:
+                return None
+            new_id = _insert_task(conn, {**original[0], "id": None, "title": title})
+            conn.execute(
+                "INSERT INTO task_comments (task_id, author, text, timestamp)"
+                " SELECT ?, author, text, timestamp FROM task_comments"
+                " WHERE task_id = ? ORDER BY id",
+                (new_id, task_id),
+            )
+        return self.get_task(new_id)
+
+    def add_comment(self, task_id: int, author: str, text: str) -> dict | None:
+        comment = {"author": author, "text": text, "timestamp": _now()}
+        with self.pool.transaction() as conn:
+            if not _task_exists(conn, task_id):
+                return None
+            conn.execute(
+                "INSERT INTO task_comments (task_id, author, text, timestamp)"
+                " VALUES (?, ?, ?, ?)",
+                (task_id, author, text, comment["timestamp"]),
+            )
+        return comment
+
+    def append_history(self, task_id: int, user: str, action: str) -> dict:
+        log = {"user": user, "action": action, "timestamp": _now()}
+        with self.pool.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO task_history_log (task_id, user, action, timestamp)"
+                " VALUES (?, ?, ?, ?)",
+                (task_id, user, action, log["timestamp"]),
+            )
+        return {"id": cursor.lastrowid, **log}
+
+    def list_history(
+        self,
+        task_id: int,
+        before: tuple[str, int] | None = None,
+        limit: int = HISTORY_PAGE_SIZE,
+    ) -> list[dict]:
+        with self.pool.connection() as conn:
+            if before is None:
+                rows = conn.execute(
+                    "SELECT id, user, action, timestamp FROM task_history_log"
+                    " WHERE task_id = ? ORDER BY timestamp DESC, id DESC LIMIT ?",
+                    (task_id, limit),
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT id, user, action, timestamp FROM task_history_log"
+                    " WHERE task_id = ? AND (timestamp, id) < (?, ?)"
+                    " ORDER BY timestamp DESC, id DESC LIMIT ?",
+                    (task_id, *before, limit),
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def archive_done_tasks(
+        self, older_than_days: int = ARCHIVE_AFTER_DAYS
+    ) -> list[int]:
+        cutoff = (
+            datetime.datetime.now() - datetime.timedelta(days=older_than_days)
+        ).isoformat()
+        archived_at = _now()
+        with self.pool.transaction() as conn:
+            rows = conn.execute(
+                "SELECT * FROM tasks WHERE status = 'Done' AND done_at < ?"
+                " ORDER BY id LIMIT ?",
+                (cutoff, ARCHIVE_BATCH_SIZE),
+            ).fetchall()
+            done_at = {row["id"]: row["done_at"] for row in rows}
+            tasks = self._hydrate(conn, rows)
+            conn.executemany(
+                "INSERT OR REPLACE INTO archived_tasks (id, title, assignee, done_at,"
+                " archived_at, search_text, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        task["id"],
+                        task["title"],
+                        task["assignee"],
+                        done_at[task["id"]],
+                        archived_at,
+                        " ".join(
+                            [task["title"], task["description"], *task["tags"]]
+                        ).lower(),
+                        zlib.compress(json.dumps(task).encode()),
+                    )
+                    for task in tasks
+                ],
+            )
+            conn.executemany(
+                "DELETE FROM tasks WHERE id = ?", [(task["id"],) for task in tasks]
+            )
+        return [task["id"] for task in tasks]
+
+    def search_archive(self, query: str, limit: int = 50) -> list[dict]:
+        where, params = "", []
+        if expression := fts_match_expression(query):
+            where = (
+                " WHERE id IN"
+                " (SELECT rowid FROM archive_search WHERE archive_search MATCH ?)"
+            )
+            params.append(expression)
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT id, title, assignee, substr(done_at, 1, 10) AS done_at"
+                f" FROM archived_tasks{where} ORDER BY done_at DESC LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def is_archived(self, task_id: int) -> bool:
+        with self.pool.connection() as conn:
+            return (
+                conn.execute(
+                    "SELECT 1 FROM archived_tasks WHERE id = ?", (task_id,)
+                ).fetchone()
+                is not None
+            )
+
+    def restore_task(self, task_id: int, status: str = "To Do") -> dict | None:
+        with self.pool.transaction() as conn:
+            row = conn.execute(
+                "SELECT payload FROM archived_tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            task = json.loads(zlib.decompress(row["payload"]))
+            _insert_task(conn, {**task, "status": status})
+            _insert_comments(conn, task_id, task["comments"])
+            _insert_history(conn, task_id, task.get("history", []))
+            conn.execute("DELETE FROM archived_tasks WHERE id = ?", (task_id,))
+        return self.get_task(task_id)
+
+
+task_store = TaskStore(database)
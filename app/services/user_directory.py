@@ -0,0 +1,173 @@
+import bisect
+import os
+import threading
+import time
+import unicodedata
+
+from app.services.user_store import UserStore, user_store
+
+# How long a worker serves its index before re-reading the users table, which
+# bounds how long a write made on another worker stays invisible here.
+DIRECTORY_TTL_SECONDS = int(os.environ.get("USER_DIRECTORY_TTL_SECONDS", "60"))
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents so "José" and "jose" index the same."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).strip()
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+# "online" has no precomputed key: presence changes far more often than the
+# directory, so that order is derived from the name order at query time.
+SORT_COLUMNS = ("name", "department", "role", "online")
+
+
+def directory_entry(user: dict) -> dict:
+    """Precomputed search keys for one user."""
+    name = normalize(user["full_name"])
+    email = user["email"].lower()
+    text = f"{name} {email}"
+    return {
+        "department": user["department"],
+        "text": text,
+        "tokens": sorted(set(text.replace("@", " ").replace(".", " ").split())),
+        "trigrams": trigrams(text),
+        "sort_keys": {
+            "name": (name, user["email"]),
+            "department": (normalize(user["department"]), name, user["email"]),
+            "role": (user["role"], name, user["email"]),
+        },
+    }
+
+
+class DirectoryIndex:
+    """Search keys and presorted orders for every user, built in one pass."""
+
+    def __init__(self, profiles: list[dict]):
+        self.profiles = {profile["email"]: profile for profile in profiles}
+        self.full_names = {
+            email: profile["full_name"] for email, profile in self.profiles.items()
+        }
+        self.entries = {
+            email: directory_entry(profile) for email, profile in self.profiles.items()
+        }
+        self.orders = {
+            column: sorted(
+                entry["sort_keys"][column] for entry in self.entries.values()
+            )
+            for column in ("name", "department", "role")
+        }
+        self.tokens = sorted(
+            (token, email)
+            for email, entry in self.entries.items()
+            for token in entry["tokens"]
+        )
+        self.trigrams: dict[str, set[str]] = {}
+        self.department_members: dict[str, set[str]] = {}
+        for email, entry in self.entries.items():
+            for gram in entry["trigrams"]:
+                self.trigrams.setdefault(gram, set()).add(email)
+            self.department_members.setdefault(entry["department"], set()).add(email)
+        self.departments = sorted(self.department_members)
+
+    def search(self, query: str) -> set[str]:
+        """Emails whose name or address contains ``query``.
+
+        Queries shorter than a trigram fall back to word-prefix matching.
+        """
+        if len(query) < 3:
+            start = bisect.bisect_left(self.tokens, (query, ""))
+            matches = set()
+            for token, email in self.tokens[start:]:
+                if not token.startswith(query):
+                    break
+                matches.add(email)
+            return matches
+        buckets = sorted(
+            (self.trigrams.get(gram, set()) for gram in trigrams(query)), key=len
+        )
+        return {
+            email
+            for email in set(buckets[0]).intersection(*buckets[1:])
+            if query in self.entries[email]["text"]
+        }
+
+    def page(
+        self,
+        query: str,
+        department: str | None,
+        sort: str,
+        descending: bool,
+        online: set[str],
+        page: int,
+        page_size: int,
+    ) -> tuple[int, int, list[str]]:
+        """Total matches, the page clamped to range, and that page's emails.
+
+        Unfiltered pages are sliced straight out of the presorted column order;
+        filtered ones only sort the matches.
+        """
+        query = normalize(query)
+        buckets = []
+        if query:
+            buckets.append(self.search(query))
+        if department:
+            buckets.append(self.department_members.get(department, set()))
+        column = "name" if sort == "online" else sort
+        if buckets:
+            buckets.sort(key=len)
+            matches = set(buckets[0]).intersection(*buckets[1:])
+            keys = sorted(self.entries[email]["sort_keys"][column] for email in matches)
+        else:
+            keys = self.orders[column]
+        total = len(keys)
+        page = min(page, max(0, (total - 1) // page_size))
+        if sort == "online":
+            keys = [key for key in keys if key[-1] in online] + [
+                key for key in keys if key[-1] not in online
+            ]
+        start = page * page_size
+        if descending:
+            start = total - start - page_size
+            keys = keys[max(0, start) : start + page_size][::-1]
+        else:
+            keys = keys[start : start + page_size]
+        return total, page, [key[-1] for key in keys]
+
+
+class UserDirectory:
+    """The directory index, built once per worker and shared by every session.
+
+    Writes through ``user_store`` in this worker drop the index so the next
+    reader rebuilds it; writes on other workers show up within
+    ``DIRECTORY_TTL_SECONDS``.
+    """
+
+    def __init__(self, store: UserStore, ttl_seconds: int = DIRECTORY_TTL_SECONDS):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._index: DirectoryIndex | None = None
+        self._built_at = 0.0
+        store.on_change(self.invalidate)
+
+    def invalidate(self):
+        with self._lock:
+            self._index = None
+
+    def index(self) -> DirectoryIndex:
+        with self._lock:
+            if (
+                self._index is None
+                or time.monotonic() - self._built_at > self.ttl_seconds
+            ):
+                self._index = DirectoryIndex(self.store.list_profiles())
+                self._built_at = time.monotonic()
+            return self._index
+
+
+user_directory = UserDirectory(user_store)
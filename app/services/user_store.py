@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import os
+import sqlite3
+from typing import Callable
+
+from app.services.database import ConnectionPool, database
+from app.services.passwords import (
+    SCHEME,
+    hash_password,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
+
+PASSWORD_MIGRATION_BATCH_SIZE = int(
+    os.environ.get("PASSWORD_MIGRATION_BATCH_SIZE", "50")
+)
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    full_name TEXT NOT NULL,
+    department TEXT NOT NULL,
+    password TEXT NOT NULL,
+    role TEXT NOT NULL DEFAULT 'Standard',
+    language TEXT NOT NULL DEFAULT 'Portugués (Brasil)',
+    timezone TEXT NOT NULL DEFAULT '(GMT-03:00) Brasilía'
+);
+"""
+
+SEED_USERS = [
+    {
+        "full_name": "Admin User",
+        "email": "admin@example.com",
+        "department": "Management",
+        "password": "Password123!",
+        "role": "Admin",
+        "language": "Portugués (Brasil)",
+        "timezone": "(GMT-03:00) Brasilía",
+    },
+    {
+        "full_name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "department": "Engineering",
+        "password": "Password123!",
+        "role": "Standard",
+        "language": "English (US)",
+        "timezone": "(GMT-08:00) Pacific Time",
+    },
+    {
+        "full_name": "John Smith",
+        "email": "john.smith@example.com",
+        "department": "Marketing",
+        "password": "Password123!",
+        "role": "Standard",
+        "language": "Portugués (Brasil)",
+        "timezone": "(GMT-03:00) Brasilía",
+    },
+]
+
+# What a session may see about itself, and about everyone else.
+PROFILE_FIELDS = (
+    "email",
+    "full_name",
+    "department",
+    "role",
+    "language",
+    "timezone",
+)
+CONTACT_FIELDS = ("email", "full_name", "department")
+EDITABLE_FIELDS = (
+    "full_name",
+    "department",
+    "password",
+    "role",
+    "language",
+    "timezone",
+)
+
+
+def _insert_user(conn: sqlite3.Connection, user: dict) -> bool:
+    cursor = conn.execute(
+        "INSERT OR IGNORE INTO users (email, full_name, department, password, role,"
+        " language, timezone) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            user["email"],
+            user["full_name"],
+            user["department"],
+            user["password"],
+            user.get("role", "Standard"),
+            user.get("language", "Portugués (Brasil)"),
+            user.get("timezone", "(GMT-03:00) Brasilía"),
+        ),
+    )
+    return cursor.rowcount > 0
+
+
+def _seed_users(conn: sqlite3.Connection):
+    if conn.execute("SELECT 1 FROM users LIMIT 1").fetchone():
+        return
+    for user in SEED_USERS:
+        _insert_user(conn, {**user, "password": hash_password(user["password"])})
+
+
+class UserStore:
+    """Server-side user records; password hashes never leave this module.
+
+    ``password`` values passed in are plain text. They are hashed with
+    scrypt on the password worker pool before they are written.
+    """
+
+    def __init__(self, pool: ConnectionPool):
+        self.pool = pool
+        self._change_listeners: list[Callable[[], None]] = []
+        pool.register_schema(SCHEMA, seed=_seed_users)
+
+    def on_change(self, listener: Callable[[], None]):
+        """Call ``listener`` after every write that changes a profile."""
+        self._change_listeners.append(listener)
+
+    def _changed(self):
+        for listener in self._change_listeners:
+            listener()
+
+    def _select(self, fields: tuple[str, ...], where: str = "", params=()) -> list:
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(fields)} FROM users {where}", params
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_profile(self, email: str) -> dict | None:
+        rows = self._select(PROFILE_FIELDS, "WHERE email = ?", (email,))
+        return rows[0] if rows else None
+
+    def list_profiles(self) -> list[dict]:
+        return self._select(PROFILE_FIELDS)
+
+    def list_contacts(self) -> list[dict]:
+        return self._select(CONTACT_FIELDS, "ORDER BY full_name")
+
+    def exists(self, email: str) -> bool:
+        return bool(self._select(("1",), "WHERE email = ?", (email,)))
+
+    async def check_password(self, email: str, password: str) -> dict | None:
+        """Return the user's profile if ``password`` is correct.
+
+        A hash made with older cost parameters is replaced on success.
+        """
+        rows = self._select(("password",), "WHERE email = ?", (email,))
+        if not rows or not await verify_password_async(password, rows[0]["password"]):
+            return None
+        if needs_rehash(rows[0]["password"]):
+            await self._store_password(email, password)
+        return self.get_profile(email)
+
+    async def migrate_plaintext_passwords(
+        self, batch_size: int = PASSWORD_MIGRATION_BATCH_SIZE
+    ) -> int:
+        """Hash up to ``batch_size`` passwords still stored in plain text.
+
+        Hashing happens on the password pool before the write transaction,
+        and a row is only updated if it still holds the value that was
+        hashed, so a password changed in the meantime is left alone.
+        """
+        rows = self._select(
+            ("email", "password"),
+            "WHERE password NOT LIKE ? LIMIT ?",
+            (f"{SCHEME}$%", batch_size),
+        )
+        hashes = await asyncio.gather(
+            *(hash_password_async(row["password"]) for row in rows)
+        )
+        with self.pool.transaction() as conn:
+            conn.executemany(
+                "UPDATE users SET password = ? WHERE email = ? AND password = ?",
+                [
+                    (password_hash, row["email"], row["password"])
+                    for password_hash, row in zip(hashes, rows)
+                ],
+            )
+        return len(rows)
+
+    async def _store_password(self, email: str, password: str):
+        password_hash = await hash_password_async(password)
+        with self.pool.transaction() as conn:
+            conn.execute(
+                "UPDATE users SET password = ? WHERE email = ?", (password_hash, email)
+            )
+
+    async def create_user(self, user: dict) -> bool:
+        user = {**user, "password": await hash_password_async(user["password"])}
+        with self.pool.transaction() as conn:
+            created = _insert_user(conn, user)
+        if created:
+            self._changed()
+        return created
+
+    async def update_user(self, email: str, fields: dict) -> dict | None:
+        if "password" in fields:
+            fields = {
+                **fields,
+                "password": await hash_password_async(fields["password"]),
+            }
+        columns = [name for name in EDITABLE_FIELDS if name in fields]
+        if columns:
+            with self.pool.transaction() as conn:
+                conn.execute(
+                    f"UPDATE users SET {', '.join(f'{name} = ?' for name in columns)}"
+                    " WHERE email = ?",
+                    [fields[name] for name in columns] + [email],
+                )
+        if any(name != "password" for name in columns):
+            self._changed()
+        return self.get_profile(email)
+
+    def delete_user(self, email: str) -> bool:
+        with self.pool.transaction() as conn:
+            cursor = conn.execute("DELETE FROM users WHERE email = ?", (email,))
+        if cursor.rowcount > 0:
+            self._changed()
+        return cursor.rowcount > 0
+
+
+user_store = UserStore(database)
+
+
+async def run_password_migration():
+    """Hash passwords left in plain text by older releases, a batch at a time.
+
+    Until a row is migrated its user can still sign in; ``check_password``
+    accepts the plain value and rehashes it.
+    """
+    try:
+        while True:
+            migrated = await user_store.migrate_plaintext_passwords()
+            if migrated:
+                logger.info("Hashed %d plain-text passwords", migrated)
+            if migrated < PASSWORD_MIGRATION_BATCH_SIZE:
+                return
+    except Exception:
+        logger.exception("Password migration failed")
@@ -0,0 +1,169 @@
+import json
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+import reflex as rx
+from reflex.middleware import Middleware
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+from app.services.state_metrics import lock_metrics
+
+VAR_PROFILING_ENABLED = os.environ.get("COMPUTED_VAR_PROFILING", "") == "1"
+
+_current_handler: ContextVar[str] = ContextVar("current_handler", default="unknown")
+
+
+@dataclass
+class VarStats:
+    recomputes: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+    output_bytes: int = 0
+    last_output_bytes: int = 0
+
+
+class VarProfiler:
+    """Recompute counters for computed vars, keyed by (event handler, var).
+
+    Counts are cumulative. Output size is the length of the value's JSON
+    encoding, which is roughly what the var adds to a delta.
+    """
+
+    def __init__(self):
+        self._stats: dict[tuple[str, str], VarStats] = {}
+
+    def record(self, var: str, seconds: float, output_bytes: int):
+        stats = self._stats.setdefault((_current_handler.get(), var), VarStats())
+        stats.recomputes += 1
+        stats.seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+        stats.output_bytes += output_bytes
+        stats.last_output_bytes = output_bytes
+
+    def snapshot(self) -> list[dict]:
+        return [
+            {"handler": handler, "var": var, **vars(stats)}
+            for (handler, var), stats in sorted(self._stats.items())
+        ]
+
+    def reset(self):
+        self._stats.clear()
+
+
+var_profiler = VarProfiler()
+
+
+def _timed(var: str, fget):
+    def profiled_fget(state):
+        started = time.perf_counter()
+        value = fget(state)
+        elapsed = time.perf_counter() - started
+        var_profiler.record(var, elapsed, len(json.dumps(value, default=str)))
+        return value
+
+    return profiled_fget
+
+
+def profile_computed_vars(state: type[rx.State] = rx.State):
+    """Time every computed var on ``state`` and its substates.
+
+    Must run after the states are defined: Reflex has already derived each
+    var's dependencies from the original function, so swapping the getter
+    does not change when a var is recomputed. The var evaluated on access is
+    the descriptor in the class ``__dict__``; ``computed_vars`` holds copies.
+    """
+    for name in state.computed_vars:
+        computed_var = vars(state).get(name)
+        if computed_var is None:
+            continue
+        # ComputedVar is a frozen dataclass.
+        object.__setattr__(
+            computed_var,
+            "_fget",
+            _timed(f"{state.__name__}.{name}", computed_var._fget),
+        )
+    for substate in state.get_substates():
+        profile_computed_vars(substate)
+
+
+class VarProfilingMiddleware(Middleware):
+    """Attribute recomputes to the event being processed."""
+
+    async def preprocess(self, app: Any, state: Any, event: Any) -> None:
+        _current_handler.set(event.name)
+        return None
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text() -> str:
+    lines = []
+
+    def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, Any]]):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{name}{{{labels}}} {value}" for labels, value in samples)
+
+    profile = var_profiler.snapshot()
+    var_labels = [
+        f'handler="{_label(row["handler"])}",var="{_label(row["var"])}"'
+        for row in profile
+    ]
+    for name, field, help_text in (
+        ("computed_var_recomputes_total", "recomputes", "Computed var evaluations."),
+        ("computed_var_seconds_total", "seconds", "Time spent evaluating."),
+        ("computed_var_output_bytes_total", "output_bytes", "JSON size produced."),
+    ):
+        metric(
+            name,
+            "counter",
+            help_text,
+            [(labels, row[field]) for labels, row in zip(var_labels, profile)],
+        )
+
+    locks = sorted(lock_metrics.snapshot().items())
+    lock_labels = [f'state="{_label(state)}"' for state, _ in locks]
+    for name, field, help_text in (
+        ("state_lock_acquisitions_total", "acquisitions", "State lock acquisitions."),
+        ("state_lock_contended_total", "contended", "Acquisitions that waited."),
+        ("state_lock_wait_seconds_total", "wait_seconds", "Time spent acquiring."),
+        ("state_lock_hold_seconds_total", "hold_seconds", "Time the lock was held."),
+    ):
+        metric(
+            name,
+            "counter",
+            help_text,
+            [
+                (labels, getattr(stats, field))
+                for labels, (_, stats) in zip(lock_labels, locks)
+            ],
+        )
+    return "\n".join(lines) + "\n"
+
+
+async def _computed_vars_endpoint(request: Request) -> JSONResponse:
+    return JSONResponse(var_profiler.snapshot())
+
+
+async def _metrics_endpoint(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(
+        prometheus_text(), media_type="text/plain; version=0.0.4"
+    )
+
+
+def debug_api() -> Starlette:
+    """Routes mounted in front of the Reflex backend while profiling is on."""
+    return Starlette(
+        routes=[
+            Route("/debug/computed-vars", _computed_vars_endpoint),
+            Route("/metrics", _metrics_endpoint),
+        ]
+    )
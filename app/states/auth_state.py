@@ -1,109 +1,194 @@
 import reflex as rx
 from typing import TypedDict, Literal
+import asyncio
+import bisect
+import math
 import re
+from app.services.listeners import listeners
+from app.services.presence import PRESENCE_CHANNEL, presence
+from app.services.rate_limit import (
+    ACCOUNT_LOGIN_BUCKET,
+    CLIENT_LOGIN_BUCKET,
+    rate_limiter,
+)
+from app.services.session_store import session_store
+from app.services.user_store import CONTACT_FIELDS, user_store
+from app.services.user_directory import SORT_COLUMNS, user_directory
+from app.states.identity_state import IdentityState
 
+USER_PAGE_SIZES = (10, 25, 50, 100)
 
-class User(TypedDict):
+
+class UserProfile(TypedDict):
     full_name: str
     email: str
     department: str
-    password: str
     role: Literal["Admin", "Standard"]
-    online: bool
     language: str
     timezone: str
 
 
+class Contact(TypedDict):
+    email: str
+    full_name: str
+    department: str
+
+
+def validate_password(password: str) -> bool:
+    if len(password) < 8:
+        return False
+    if not re.search("[A-Z]", password):
+        return False
+    if not re.search("[a-z]", password):
+        return False
+    if not re.search("[0-9]", password):
+        return False
+    return True
+
+
 class AuthState(rx.State):
-    users: dict[str, User] = {
-        "admin@example.com": {
-            "full_name": "Admin User",
-            "email": "admin@example.com",
-            "department": "Management",
-            "password": "Password123!",
-            "role": "Admin",
-            "online": True,
-            "language": "Portugués (Brasil)",
-            "timezone": "(GMT-03:00) Brasilía",
-        },
-        "jane.doe@example.com": {
-            "full_name": "Jane Doe",
-            "email": "jane.doe@example.com",
-            "department": "Engineering",
-            "password": "Password123!",
-            "role": "Standard",
-            "online": True,
-            "language": "English (US)",
-            "timezone": "(GMT-08:00) Pacific Time",
-        },
-        "john.smith@example.com": {
-            "full_name": "John Smith",
-            "email": "john.smith@example.com",
-            "department": "Marketing",
-            "password": "Password123!",
-            "role": "Standard",
-            "online": False,
-            "language": "Portugués (Brasil)",
-            "timezone": "(GMT-03:00) Brasilía",
-        },
-    }
-    current_user_email: str = "admin@example.com"
-    in_session: bool = True
+    session_token: str = rx.Cookie(name="session_token", same_site="strict")
+    in_session: bool = False
+    current_user_email: str = ""
+    current_user: UserProfile | None = None
+    contacts: dict[str, Contact] = {}
+    online_users: list[str] = []
     show_user_modal: bool = False
     modal_user_email: str | None = None
     modal_form_data: dict = {}
     search_query: str = ""
     department_filter: str = "All"
+    filtered_users: list[UserProfile] = []
+    user_sort: str = "name"
+    user_sort_desc: bool = False
+    user_page: int = 0
+    user_page_size: int = 25
+    user_total: int = 0
+    all_departments: list[str] = []
 
-    @rx.var
-    def current_user(self) -> User | None:
-        return self.users.get(self.current_user_email)
+    def _is_admin(self) -> bool:
+        return self.current_user is not None and self.current_user["role"] == "Admin"
 
-    @rx.var
-    def filtered_users(self) -> list[User]:
-        def filter_func(user: User) -> bool:
-            matches_search = (
-                self.search_query.lower() in user["full_name"].lower()
-                or self.search_query.lower() in user["email"].lower()
-            )
-            matches_department = (
-                self.department_filter == "All"
-                or user["department"] == self.department_filter
-            )
-            return matches_search and matches_department
+    async def _set_current_user(self, profile: UserProfile | None):
+        self.current_user = profile
+        identity = await self.get_state(IdentityState)
+        identity._set_identity(profile)
+
+    async def _load_current_user(self):
+        await self._set_current_user(
+            await asyncio.to_thread(user_store.get_profile, self.current_user_email)
+            if self.current_user_email
+            else None
+        )
+
+    async def _start_session(self, email: str):
+        self.session_token = session_store.create(email)
+        self.current_user_email = email
+        self.in_session = True
+        await self._load_current_user()
+        presence.heartbeat(email, self.router.session.client_token)
 
-        return sorted(
-            [user for user in self.users.values() if filter_func(user)],
-            key=lambda u: u["full_name"],
+    async def _clear_session(self):
+        self.session_token = ""
+        self.in_session = False
+        await self._set_current_user(None)
+        self.contacts = {}
+        self.online_users = []
+        self.filtered_users = []
+
+    async def _user_changed(self, email: str):
+        """Patch every per-session view of ``email`` after a store write."""
+        profile = await asyncio.to_thread(user_store.get_profile, email)
+        if email == self.current_user_email:
+            await self._set_current_user(profile)
+        if profile is None:
+            self.contacts.pop(email, None)
+        else:
+            self.contacts[email] = {field: profile[field] for field in CONTACT_FIELDS}
+        if self._is_admin():
+            await self._refresh_directory()
+
+    async def _refresh_directory(self):
+        """Fill ``filtered_users`` with the current page of matching users.
+
+        Every directory handler ends here, so this is where non-admins are
+        turned away.
+        """
+        if not self._is_admin():
+            self.filtered_users = []
+            self.all_departments = []
+            self.user_total = 0
+            return
+        index = await asyncio.to_thread(user_directory.index)
+        self.all_departments = index.departments
+        self.user_total, self.user_page, emails = index.page(
+            self.search_query,
+            None if self.department_filter == "All" else self.department_filter,
+            self.user_sort,
+            self.user_sort_desc,
+            set(self.online_users),
+            self.user_page,
+            self.user_page_size,
         )
+        self.filtered_users = [index.profiles[email] for email in emails]
 
     @rx.var
-    def all_departments(self) -> list[str]:
-        return sorted(list(set((user["department"] for user in self.users.values()))))
-
-    def _validate_password(self, password: str) -> bool:
-        if len(password) < 8:
-            return False
-        if not re.search("[A-Z]", password):
-            return False
-        if not re.search("[a-z]", password):
-            return False
-        if not re.search("[0-9]", password):
-            return False
-        return True
+    def user_page_count(self) -> int:
+        return max(1, -(-self.user_total // self.user_page_size))
+
+    @rx.event
+    async def load_user_directory(self):
+        await self._refresh_directory()
+
+    @rx.event
+    async def set_search_query(self, query: str):
+        self.search_query = query
+        self.user_page = 0
+        await self._refresh_directory()
+
+    @rx.event
+    async def set_department_filter(self, department: str):
+        self.department_filter = department
+        self.user_page = 0
+        await self._refresh_directory()
+
+    @rx.event
+    async def set_user_sort(self, column: str):
+        if column not in SORT_COLUMNS:
+            return
+        if column == self.user_sort:
+            self.user_sort_desc = not self.user_sort_desc
+        else:
+            self.user_sort = column
+            self.user_sort_desc = False
+        self.user_page = 0
+        await self._refresh_directory()
 
     @rx.event
-    def sign_up(self, form_data: dict):
+    async def set_user_page(self, page: int):
+        self.user_page = max(0, page)
+        await self._refresh_directory()
+
+    @rx.event
+    async def set_user_page_size(self, size: str):
+        if int(size) not in USER_PAGE_SIZES:
+            return
+        self.user_page_size = int(size)
+        self.user_page = 0
+        await self._refresh_directory()
+
+    @rx.event
+    async def sign_up(self, form_data: dict):
         email = form_data["email"].lower().strip()
         password = form_data["password"]
         confirm_password = form_data["confirm_password"]
         if not email.endswith("@example.com"):
             yield rx.toast.error("Use um e-mail corporativo válido (@example.com)")
             return
-        if email in self.users:
+        if user_store.exists(email):
             yield rx.toast.error("E-mail já cadastrado.")
             return
-        if not self._validate_password(password):
+        if not validate_password(password):
             yield rx.toast.error(
                 "A senha deve ter pelo menos 8 caracteres, uma maiúscula, uma minúscula e um número."
             )
@@ -111,52 +196,119 @@ class AuthState(rx.State):
         if password != confirm_password:
             yield rx.toast.error("As senhas não coincidem.")
             return
-        new_user: User = {
-            "full_name": form_data["full_name"].strip(),
-            "email": email,
-            "department": form_data["department"].strip(),
-            "password": password,
-            "role": "Standard",
-            "online": True,
-        }
-        self.users[email] = new_user
-        self.current_user_email = email
-        self.in_session = True
+        created = await user_store.create_user(
+            {
+                "full_name": form_data["full_name"].strip(),
+                "email": email,
+                "department": form_data["department"].strip(),
+                "password": password,
+                "role": "Standard",
+            }
+        )
+        if not created:
+            yield rx.toast.error("E-mail já cadastrado.")
+            return
+        await self._start_session(email)
         yield rx.toast.success("Conta criada com sucesso!")
-        return rx.redirect("/")
+        yield rx.redirect("/")
 
     @rx.event
-    def sign_in(self, form_data: dict):
+    async def sign_in(self, form_data: dict):
         email = form_data["email"].lower()
-        if user := self.users.get(email):
-            if user["password"] == form_data["password"]:
-                self.current_user_email = email
-                self.in_session = True
-                user["online"] = True
-                self.users[email] = user
-                yield rx.toast.success(f"Bem-vindo de volta, {user['full_name']}!")
-                return rx.redirect("/")
+        # Both buckets are checked before any hashing work is spent on the attempt.
+        retry_after = await rate_limiter.consume(
+            f"login:client:{self.router.session.client_ip}", CLIENT_LOGIN_BUCKET
+        ) or await rate_limiter.consume(f"login:account:{email}", ACCOUNT_LOGIN_BUCKET)
+        if retry_after:
+            self.in_session = False
+            yield rx.toast.error(
+                f"Muitas tentativas. Tente novamente em {math.ceil(retry_after)} s."
+            )
+            return
+        if user := await user_store.check_password(email, form_data["password"]):
+            await rate_limiter.reset(f"login:account:{email}")
+            await self._start_session(email)
+            yield rx.toast.success(f"Bem-vindo de volta, {user['full_name']}!")
+            yield rx.redirect("/")
+            return
         self.in_session = False
         yield rx.toast.error("E-mail ou senha inválidos.")
 
     @rx.event
-    def sign_out(self):
-        if self.current_user:
-            user = self.current_user
-            user["online"] = False
-            self.users[self.current_user_email] = user
-        self.in_session = False
-        self.current_user_email = ""
+    async def sign_out(self):
+        if self.current_user_email:
+            presence.disconnect(
+                self.current_user_email, self.router.session.client_token
+            )
+        if self.session_token:
+            session_store.revoke(self.session_token)
+        await self._clear_session()
         return rx.redirect("/login")
 
     @rx.event
-    def check_session(self):
-        if not self.in_session:
+    async def check_session(self):
+        """Resolve the session cookie; runs on every page load.
+
+        A warm token is answered from the session cache, and the profile and
+        contacts are only reloaded when the signed-in user changes.
+        """
+        email = await asyncio.to_thread(session_store.resolve, self.session_token)
+        if email is not None and (
+            email != self.current_user_email or self.current_user is None
+        ):
+            self.current_user_email = email
+            self.in_session = True
+            await self._load_current_user()
+            contacts = await asyncio.to_thread(user_store.list_contacts)
+            self.contacts = {contact["email"]: contact for contact in contacts}
+        if email is None or self.current_user is None:
+            await self._clear_session()
             return rx.redirect("/login")
+        presence.heartbeat(self.current_user_email, self.router.session.client_token)
+        self.online_users = sorted(await asyncio.to_thread(presence.online_users))
+        if listeners.claim(
+            "presence", self.router.session.client_token, self.current_user_email
+        ):
+            return AuthState.listen_for_presence
+
+    @rx.event(background=True)
+    async def listen_for_presence(self):
+        async with self:
+            email = self.current_user_email
+            client_token = self.router.session.client_token
+        if not listeners.is_running("presence", client_token, email):
+            return
+        async with listeners.listen(
+            "presence", client_token, email, PRESENCE_CHANNEL
+        ) as changes:
+            async for change in changes:
+                async with self:
+                    if not self.in_session:
+                        return
+                    current = set(self.online_users)
+                    went_offline = current.intersection(change["offline"])
+                    came_online = set(change["online"]) - current
+                    # Page loads re-read presence, so a change may already
+                    # be applied; leaving the var untouched sends nothing.
+                    if not (went_offline or came_online):
+                        continue
+                    online_users = [
+                        email
+                        for email in self.online_users
+                        if email not in went_offline
+                    ]
+                    for email in came_online:
+                        bisect.insort(online_users, email)
+                    self.online_users = online_users
+                    if self.user_sort == "online" and self._is_admin():
+                        await self._refresh_directory()
 
-    def open_user_modal(self, email: str | None = None):
+    async def open_user_modal(self, email: str | None = None):
+        if not self._is_admin():
+            return
         self.modal_user_email = email
-        if email and (user := self.users.get(email)):
+        index = await asyncio.to_thread(user_directory.index)
+        if email and (user := index.profiles.get(email)):
             self.modal_form_data = {
                 "full_name": user["full_name"],
                 "email": user["email"],
@@ -182,17 +334,19 @@ class AuthState(rx.State):
             return AuthState.create_user(form_data)
 
     @rx.event
-    def create_user(self, form_data: dict):
+    async def create_user(self, form_data: dict):
+        if not self._is_admin():
+            return
         email = form_data["email"].lower().strip()
         password = form_data["password"]
         confirm_password = form_data["confirm_password"]
         if not email.endswith("@example.com"):
             yield rx.toast.error("Use um e-mail corporativo válido (@example.com)")
             return
-        if email in self.users:
+        if user_store.exists(email):
             yield rx.toast.error("E-mail já cadastrado.")
             return
-        if not password or not self._validate_password(password):
+        if not password or not validate_password(password):
             yield rx.toast.error(
                 "A senha deve ter pelo menos 8 caracteres, uma maiúscula, uma minúscula e um número."
             )
@@ -200,30 +354,33 @@ class AuthState(rx.State):
         if password != confirm_password:
             yield rx.toast.error("As senhas não coincidem.")
             return
-        new_user: User = {
+        new_user = {
             "full_name": form_data["full_name"].strip(),
             "email": email,
             "department": form_data["department"].strip(),
             "password": password,
             "role": form_data["role"],
-            "online": False,
         }
-        self.users[email] = new_user
+        if not await user_store.create_user(new_user):
+            yield rx.toast.error("E-mail já cadastrado.")
+            return
+        await self._user_changed(email)
         yield rx.toast.success(f"Usuário {new_user['full_name']} criado.")
         self.show_user_modal = False
         self.modal_user_email = None
 
     @rx.event
-    def update_user(self, form_data: dict):
-        if not self.modal_user_email:
+    async def update_user(self, form_data: dict):
+        if not self.modal_user_email or not self._is_admin():
             return
-        user = self.users[self.modal_user_email]
-        user["full_name"] = form_data["full_name"].strip()
-        user["department"] = form_data["department"].strip()
-        user["role"] = form_data["role"]
+        fields = {
+            "full_name": form_data["full_name"].strip(),
+            "department": form_data["department"].strip(),
+            "role": form_data["role"],
+        }
         password = form_data.get("password", "")
         if password:
-            if not self._validate_password(password):
+            if not validate_password(password):
                 yield rx.toast.error(
                     "A senha deve ter pelo menos 8 caracteres, uma maiúscula, uma minúscula e um número."
                 )
@@ -231,17 +388,21 @@ class AuthState(rx.State):
             if password != form_data.get("confirm_password"):
                 yield rx.toast.error("As senhas não coincidem.")
                 return
-            user["password"] = password
-        self.users[self.modal_user_email] = user
-        yield rx.toast.success(f"Usuário {user['full_name']} atualizado.")
+            fields["password"] = password
+        await user_store.update_user(self.modal_user_email, fields)
+        await self._user_changed(self.modal_user_email)
+        yield rx.toast.success(f"Usuário {fields['full_name']} atualizado.")
         self.show_user_modal = False
         self.modal_user_email = None
 
     @rx.event
-    def delete_user(self, email: str):
+    async def delete_user(self, email: str):
+        if not self._is_admin():
+            return
         if email == self.current_user_email:
             yield rx.toast.error("Não é possível excluir a si mesmo.")
             return
-        if email in self.users:
-            del self.users[email]
+        if user_store.delete_user(email):
+            session_store.revoke_user(email)
+            await self._user_changed(email)
             yield rx.toast.success(f"Usuário {email} excluído.")
\ No newline at end of file
@@ -1,78 +1,241 @@
 import reflex as rx
 from typing import TypedDict
-import datetime
+import asyncio
+from app.services.chat_store import (
+    LAST_MESSAGE_PREVIEW_LENGTH,
+    MESSAGE_PAGE_SIZE,
+    chat_store,
+)
+from app.services.clock import DEFAULT_TIMEZONE, format_message_time
+from app.services.listeners import listeners
+from app.services.message_bus import message_bus, user_channel
+from app.services.user_store import user_store
+from app.states.identity_state import IdentityState
 
 
 class ChatMessage(TypedDict):
+    id: int
     sender: str
     receiver: str
     text: str
-    timestamp: str
+    timestamp: int
+    display_time: str
+
+
+class ChatSearchHit(TypedDict):
+    id: int
+    peer: str
+    sender: str
+    snippet: str
+    display_time: str
+
+
+class ContactSummary(TypedDict):
+    unread: int
+    preview: str
+    display_time: str
 
 
 class ChatState(rx.State):
-    messages: list[ChatMessage] = [
-        {
-            "sender": "jane.doe@example.com",
-            "receiver": "admin@example.com",
-            "text": "Hey, can you review the latest designs for the landing page?",
-            "timestamp": "10:30 AM",
-        },
-        {
-            "sender": "admin@example.com",
-            "receiver": "jane.doe@example.com",
-            "text": "Sure, send them over. I'll take a look this afternoon.",
-            "timestamp": "10:31 AM",
-        },
-        {
-            "sender": "jane.doe@example.com",
-            "receiver": "admin@example.com",
-            "text": "Great, thanks! I've attached the Figma link to the Kanban card.",
-            "timestamp": "10:31 AM",
-        },
-        {
-            "sender": "john.smith@example.com",
-            "receiver": "admin@example.com",
-            "text": "Morning! Just wanted to confirm our marketing sync for 2 PM.",
-            "timestamp": "11:00 AM",
-        },
-    ]
+    current_chat_messages: list[ChatMessage] = []
+    has_older_messages: bool = False
+    has_newer_messages: bool = False
+    highlighted_message_id: int = 0
+    search_query: str = ""
+    search_results: list[ChatSearchHit] = []
     active_chat_with: str = "jane.doe@example.com"
-
-    def set_active_chat(self, email: str):
-        self.active_chat_with = email
+    _viewer_timezone: str = DEFAULT_TIMEZONE
+    _conversations: dict[str, dict] = {}
 
     @rx.var
-    async def current_chat_messages(self) -> list[ChatMessage]:
-        from app.states.auth_state import AuthState
-
-        auth_state = await self.get_state(AuthState)
-        current_user_email = auth_state.current_user_email
-        return [
-            msg
-            for msg in self.messages
-            if msg["sender"] == current_user_email
-            and msg["receiver"] == self.active_chat_with
-            or (
-                msg["sender"] == self.active_chat_with
-                and msg["receiver"] == current_user_email
+    def contact_summaries(self) -> dict[str, ContactSummary]:
+        return {
+            peer: {
+                "unread": conversation["unread"],
+                "preview": conversation["last_text"],
+                "display_time": format_message_time(
+                    conversation["last_timestamp"], self._viewer_timezone
+                ),
+            }
+            for peer, conversation in self._conversations.items()
+        }
+
+    async def _current_user_email(self) -> str:
+        identity = await self.get_state(IdentityState)
+        self._viewer_timezone = identity.timezone
+        return identity.current_user_email
+
+    def _present(self, message: dict) -> ChatMessage:
+        return {
+            **message,
+            "display_time": format_message_time(
+                message["timestamp"], self._viewer_timezone
+            ),
+        }
+
+    async def _fetch_page(self, before_id: int | None = None) -> list[ChatMessage]:
+        page = await asyncio.to_thread(
+            chat_store.list_messages,
+            await self._current_user_email(),
+            self.active_chat_with,
+            before_id=before_id,
+            limit=MESSAGE_PAGE_SIZE + 1,
+        )
+        self.has_older_messages = len(page) > MESSAGE_PAGE_SIZE
+        return [self._present(message) for message in page[-MESSAGE_PAGE_SIZE:]]
+
+    def _note_message(self, peer: str, message: dict, unread: int = 0):
+        conversation = self._conversations.get(peer, {"unread": 0})
+        self._conversations[peer] = {
+            "unread": conversation["unread"] + unread,
+            "last_sender": message["sender"],
+            "last_text": message["text"][:LAST_MESSAGE_PREVIEW_LENGTH],
+            "last_timestamp": message["timestamp"],
+        }
+
+    async def _fetch_newer(self, after_id: int) -> list[ChatMessage]:
+        page = await asyncio.to_thread(
+            chat_store.list_messages,
+            await self._current_user_email(),
+            self.active_chat_with,
+            after_id=after_id,
+            limit=MESSAGE_PAGE_SIZE + 1,
+        )
+        self.has_newer_messages = len(page) > MESSAGE_PAGE_SIZE
+        return [self._present(message) for message in page[:MESSAGE_PAGE_SIZE]]
+
+    async def _open_active_chat(self, around_id: int | None = None):
+        self.highlighted_message_id = around_id or 0
+        self.has_newer_messages = False
+        if not self.active_chat_with:
+            self.current_chat_messages = []
+            self.has_older_messages = False
+            return
+        await asyncio.to_thread(
+            chat_store.mark_read,
+            await self._current_user_email(),
+            self.active_chat_with,
+        )
+        if self.active_chat_with in self._conversations:
+            self._conversations[self.active_chat_with]["unread"] = 0
+        if around_id is None:
+            self.current_chat_messages = await self._fetch_page()
+            return
+        older = await self._fetch_page(before_id=around_id + 1)
+        self.current_chat_messages = [*older, *await self._fetch_newer(around_id)]
+
+    @rx.event
+    async def load_chat(self):
+        self._conversations = {
+            conversation.pop("peer"): conversation
+            for conversation in await asyncio.to_thread(
+                chat_store.list_conversations, await self._current_user_email()
             )
+        }
+        await self._open_active_chat()
+
+    @rx.event
+    async def load_older_messages(self):
+        if not self.current_chat_messages or not self.has_older_messages:
+            return
+        older = await self._fetch_page(before_id=self.current_chat_messages[0]["id"])
+        self.current_chat_messages = [*older, *self.current_chat_messages]
+
+    @rx.event
+    async def load_newer_messages(self):
+        if not self.current_chat_messages or not self.has_newer_messages:
+            return
+        newer = await self._fetch_newer(self.current_chat_messages[-1]["id"])
+        self.current_chat_messages.extend(newer)
+
+    @rx.event
+    async def start_message_listener(self):
+        current_user_email = await self._current_user_email()
+        if current_user_email and listeners.claim(
+            "chat", self.router.session.client_token, current_user_email
+        ):
+            return ChatState.listen_for_messages
+
+    @rx.event(background=True)
+    async def listen_for_messages(self):
+        async with self:
+            email = await self._current_user_email()
+            client_token = self.router.session.client_token
+        if not listeners.is_running("chat", client_token, email):
+            return
+        async with listeners.listen(
+            "chat", client_token, email, user_channel(email)
+        ) as messages:
+            async for message in messages:
+                async with self:
+                    active = message["sender"] == self.active_chat_with
+                    self._note_message(
+                        message["sender"], message, unread=0 if active else 1
+                    )
+                    current = self.current_chat_messages
+                    if active and not (
+                        self.has_newer_messages
+                        or (current and current[-1]["id"] >= message["id"])
+                    ):
+                        self.current_chat_messages.append(self._present(message))
+                # Written outside the state lock so a busy database cannot
+                # hold up this tab's other events.
+                if active:
+                    await asyncio.to_thread(
+                        chat_store.mark_read, email, message["sender"]
+                    )
+
+    @rx.event
+    async def set_active_chat(self, email: str):
+        self.active_chat_with = email
+        await self._open_active_chat()
+
+    @rx.event
+    async def search_messages(self, query: str):
+        self.search_query = query
+        if not query.strip():
+            self.search_results = []
+            return
+        email = await self._current_user_email()
+        hits = await asyncio.to_thread(chat_store.search_messages, email, query)
+        self.search_results = [
+            {
+                "id": hit["id"],
+                "peer": hit["peer"],
+                "sender": hit["sender"],
+                "snippet": hit["snippet"],
+                "display_time": format_message_time(
+                    hit["timestamp"], self._viewer_timezone
+                ),
+            }
+            for hit in hits
         ]
 
     @rx.event
-    async def send_message(self, form_data: dict):
-        from app.states.auth_state import AuthState
+    async def open_search_hit(self, peer: str, message_id: int):
+        self.active_chat_with = peer
+        await self._open_active_chat(around_id=message_id)
+        return rx.scroll_to(f"message-{message_id}")
 
-        auth_state = await self.get_state(AuthState)
-        current_user_email = auth_state.current_user_email
+    @rx.event
+    async def send_message(self, form_data: dict):
+        current_user_email = await self._current_user_email()
         message_text = form_data["message"].strip()
-        if not message_text:
+        if not current_user_email or not message_text:
             return
-        new_message: ChatMessage = {
-            "sender": current_user_email,
-            "receiver": self.active_chat_with,
-            "text": message_text,
-            "timestamp": datetime.datetime.now().strftime("%I:%M %p"),
-        }
-        self.messages.append(new_message)
-        yield
\ No newline at end of file
+        if not await asyncio.to_thread(user_store.exists, self.active_chat_with):
+            yield rx.toast.error("Contato não encontrado.")
+            return
+        new_message = await asyncio.to_thread(
+            chat_store.add_message,
+            current_user_email,
+            self.active_chat_with,
+            message_text,
+        )
+        if self.has_newer_messages:
+            await self._open_active_chat()
+        else:
+            self.current_chat_messages.append(self._present(new_message))
+        self._note_message(self.active_chat_with, new_message)
+        await message_bus.publish(user_channel(self.active_chat_with), new_message)
+        yield
@@ -0,0 +1,51 @@
+import reflex as rx
+from app.services.clock import DEFAULT_TIMEZONE
+from app.services.presence import presence
+
+
+class IdentityState(rx.State):
+    """Who this session is signed in as.
+
+    AuthState writes these fields through ``get_state`` whenever the profile
+    loads, changes or is cleared. The two are siblings rather than parent and
+    child, so handlers that only need the signed-in user load these few
+    fields without AuthState's contacts and directory page; a child would be
+    fetched along with its parent by the Redis state manager.
+    """
+
+    current_user_email: str = ""
+    display_name: str = ""
+    role: str = ""
+    language: str = "Portugués (Brasil)"
+    timezone: str = DEFAULT_TIMEZONE
+
+    def _set_identity(self, profile: dict | None):
+        if profile is None:
+            self.current_user_email = ""
+            self.display_name = ""
+            self.role = ""
+            self.language = "Portugués (Brasil)"
+            self.timezone = DEFAULT_TIMEZONE
+            return
+        self.current_user_email = profile["email"]
+        self.display_name = profile["full_name"]
+        self.role = profile["role"]
+        self.language = profile["language"]
+        self.timezone = profile["timezone"]
+
+    def _is_admin(self) -> bool:
+        return self.role == "Admin"
+
+    @rx.event
+    def presence_heartbeat(self, _tick: str = ""):
+        """Keep this tab's connection alive; driven by a client-side timer.
+
+        Reflex has no server-side disconnect hook, so a closed tab is noticed
+        when its heartbeats stop and the row outlives ``PRESENCE_TTL_SECONDS``.
+        Every open tab sends one of these, so it lives here rather than on
+        AuthState, whose directory and contacts would be loaded each time.
+        """
+        if self.current_user_email:
+            presence.heartbeat(
+                self.current_user_email, self.router.session.client_token
+            )
@@ -1,6 +1,10 @@
 import reflex as rx
 from typing import TypedDict, Literal
+import asyncio
 import datetime
+from app.services.task_store import CARD_PAGE_SIZE, HISTORY_PAGE_SIZE, task_store
+from app.services.user_directory import user_directory
+from app.states.identity_state import IdentityState
 
 
 class Comment(TypedDict):
@@ -10,6 +14,7 @@ class Comment(TypedDict):
 
 
 class HistoryLog(TypedDict):
+    id: int
     user: str
     action: str
     timestamp: str
@@ -26,89 +31,56 @@ class Task(TypedDict):
     priority: Literal["Low", "Medium", "High"]
     attachments: list[str]
     comments: list[Comment]
-    history: list[HistoryLog]
+
+
+class TaskSummary(TypedDict):
+    id: int
+    title: str
+    description: str
+    assignee: str
+    due_date: str
+    tags: list[str]
+    status: Literal["To Do", "In Progress", "Done"]
+    priority: Literal["Low", "Medium", "High"]
+    attachment_count: int
+    comment_count: int
+
+
+class ArchivedTask(TypedDict):
+    id: int
+    title: str
+    assignee: str
+    done_at: str
+
+
+class TaskCard(TypedDict):
+    id: int
+    title: str
+    description: str
+    tags: list[str]
+    priority: Literal["Low", "Medium", "High"]
+    assignee_name: str
+    attachment_count: int
+    comment_count: int
+
+
+COLUMN_CARD_VARS = {
+    "To Do": "todo_cards",
+    "In Progress": "in_progress_cards",
+    "Done": "done_cards",
+}
 
 
 class KanbanState(rx.State):
-    tasks: list[Task] = [
-        {
-            "id": 1,
-            "title": "Design new landing page",
-            "description": "Create mockups and wireframes for the new V2 landing page.",
-            "assignee": "jane.doe@example.com",
-            "due_date": "2024-08-15",
-            "tags": ["UI/UX", "High Priority"],
-            "status": "In Progress",
-            "priority": "High",
-            "attachments": ["/placeholder.svg"],
-            "comments": [
-                {
-                    "author": "admin@example.com",
-                    "text": "Let's use a blue color scheme.",
-                    "timestamp": "2024-08-01 10:00",
-                }
-            ],
-            "history": [
-                {
-                    "user": "admin@example.com",
-                    "action": "Created task",
-                    "timestamp": "2024-07-30 09:00",
-                }
-            ],
-        },
-        {
-            "id": 2,
-            "title": "Develop authentication flow",
-            "description": "Implement JWT-based authentication for the backend API.",
-            "assignee": "jane.doe@example.com",
-            "due_date": "2024-08-20",
-            "tags": ["Backend", "Security"],
-            "status": "In Progress",
-            "priority": "High",
-            "attachments": [],
-            "comments": [],
-            "history": [],
-        },
-        {
-            "id": 3,
-            "title": "Setup CI/CD pipeline",
-            "description": "Configure GitHub Actions for automated testing and deployment.",
-            "assignee": "admin@example.com",
-            "due_date": "2024-08-10",
-            "tags": ["DevOps"],
-            "status": "Done",
-            "priority": "Medium",
-            "attachments": [],
-            "comments": [],
-            "history": [],
-        },
-        {
-            "id": 4,
-            "title": "Write API documentation",
-            "description": "Use Swagger/OpenAPI to document all API endpoints.",
-            "assignee": "john.smith@example.com",
-            "due_date": "2024-08-25",
-            "tags": ["Documentation"],
-            "status": "To Do",
-            "priority": "Medium",
-            "attachments": [],
-            "comments": [],
-            "history": [],
-        },
-        {
-            "id": 5,
-            "title": "Plan Q4 marketing campaign",
-            "description": "Outline strategy, budget, and KPIs for the upcoming quarter.",
-            "assignee": "john.smith@example.com",
-            "due_date": "2024-09-01",
-            "tags": ["Marketing", "Strategy"],
-            "status": "To Do",
-            "priority": "Low",
-            "attachments": [],
-            "comments": [],
-            "history": [],
-        },
-    ]
+    """The slice of the board this tab is looking at.
+
+    Only the visible card windows, their counts and the filter settings live
+    here; the store answers every window with an indexed query. Each write
+    re-reads the windows it may have changed, which also picks up what other
+    users did since the last event.
+    """
+
+    _column_limits: dict[str, int] = {}
     columns: list[Literal["To Do", "In Progress", "Done"]] = [
         "To Do",
         "In Progress",
@@ -117,175 +89,298 @@ class KanbanState(rx.State):
     show_add_task_modal: bool = False
     show_edit_task_modal: bool = False
     editing_task_id: int | None = None
+    editing_task: Task | None = None
+    editing_history: list[HistoryLog] = []
+    has_more_history: bool = False
     assignee_filter: str = "All"
     tag_filter: str = "All"
+    search_query: str = ""
+    todo_cards: list[TaskCard] = []
+    in_progress_cards: list[TaskCard] = []
+    done_cards: list[TaskCard] = []
+    column_counts: dict[str, int] = {"To Do": 0, "In Progress": 0, "Done": 0}
+    all_tags: list[str] = []
+    due_today_count: int = 0
+    show_archive_modal: bool = False
+    archive_query: str = ""
+    archive_results: list[ArchivedTask] = []
 
-    @rx.var
-    def editing_task(self) -> Task | None:
-        if self.editing_task_id is None:
-            return None
-        for task in self.tasks:
-            if task["id"] == self.editing_task_id:
-                return task
-        return None
-
-    @rx.var
-    def all_tags(self) -> list[str]:
-        tags = set()
-        for task in self.tasks:
-            for tag in task["tags"]:
-                tags.add(tag)
-        return sorted(list(tags))
-
-    @rx.var
-    def filtered_tasks(self) -> list[Task]:
-        def filter_func(task: Task) -> bool:
-            matches_assignee = (
-                self.assignee_filter == "All"
-                or task["assignee"] == self.assignee_filter
-            )
-            matches_tag = self.tag_filter == "All" or self.tag_filter in task["tags"]
-            return matches_assignee and matches_tag
-
-        return [task for task in self.tasks if filter_func(task)]
-
-    @rx.var
-    def tasks_by_column(self) -> dict[str, list[Task]]:
-        tasks_by_col = {col: [] for col in self.columns}
-        for task in self.filtered_tasks:
-            if task["status"] in tasks_by_col:
-                tasks_by_col[task["status"]].append(task)
-        return tasks_by_col
+    def _filters(self) -> dict:
+        return {
+            "assignee": None if self.assignee_filter == "All" else self.assignee_filter,
+            "tag": None if self.tag_filter == "All" else self.tag_filter,
+            "query": self.search_query.strip(),
+        }
+
+    async def _assignee_names(self) -> dict[str, str]:
+        # Shared by every session in this worker, so no AuthState load. A
+        # stale index is rebuilt from the store, so it is read off the loop.
+        index = await asyncio.to_thread(user_directory.index)
+        return index.full_names
+
+    def _card(self, task: TaskSummary, names: dict[str, str]) -> TaskCard:
+        return {
+            "id": task["id"],
+            "title": task["title"],
+            "description": task["description"],
+            "tags": list(task["tags"]),
+            "priority": task["priority"],
+            "assignee_name": names.get(task["assignee"], task["assignee"]),
+            "attachment_count": task["attachment_count"],
+            "comment_count": task["comment_count"],
+        }
+
+    def _column_cards(self, status: str) -> list[TaskCard] | None:
+        var_name = COLUMN_CARD_VARS.get(status)
+        return getattr(self, var_name) if var_name else None
+
+    def _column_limit(self, status: str) -> int:
+        return self._column_limits.get(status, CARD_PAGE_SIZE)
+
+    async def _refresh_columns(self):
+        """Re-read every column window; only columns that changed are sent."""
+        counts, windows = await asyncio.to_thread(
+            task_store.load_columns,
+            {status: self._column_limit(status) for status in COLUMN_CARD_VARS},
+            **self._filters(),
+        )
+        counts = {col: counts.get(col, 0) for col in self.columns}
+        if counts != self.column_counts:
+            self.column_counts = counts
+        names = await self._assignee_names()
+        for status, var_name in COLUMN_CARD_VARS.items():
+            cards = [self._card(task, names) for task in windows[status]]
+            if cards != getattr(self, var_name):
+                setattr(self, var_name, cards)
+
+    async def _refresh_facets(self, tags_changed: bool = True):
+        """Re-read the due-today count, and the tag list if a write touched tags."""
+        self.due_today_count = await asyncio.to_thread(
+            task_store.count_open_due, datetime.date.today().isoformat()
+        )
+        if not tags_changed:
+            return
+        tags = await asyncio.to_thread(task_store.list_tags)
+        if tags != self.all_tags:
+            self.all_tags = tags
+
+    async def _refresh_board(self, tags_changed: bool = True):
+        await self._refresh_columns()
+        await self._refresh_facets(tags_changed)
+
+    @rx.event
+    async def load_more_cards(self, status: str):
+        cards = self._column_cards(status)
+        if cards is None:
+            return
+        self._column_limits[status] = self._column_limit(status) + CARD_PAGE_SIZE
+        page = await asyncio.to_thread(
+            task_store.list_task_summaries,
+            status,
+            cards[-1]["id"] if cards else 0,
+            CARD_PAGE_SIZE,
+            **self._filters(),
+        )
+        names = await self._assignee_names()
+        cards.extend(self._card(task, names) for task in page)
+
+    @rx.event
+    async def set_assignee_filter(self, assignee: str):
+        self.assignee_filter = assignee
+        self._column_limits = {}
+        await self._refresh_columns()
+
+    @rx.event
+    async def set_tag_filter(self, tag: str):
+        self.tag_filter = tag
+        self._column_limits = {}
+        await self._refresh_columns()
+
+    @rx.event
+    async def set_search_query(self, query: str):
+        self.search_query = query
+        self._column_limits = {}
+        await self._refresh_columns()
+
+    @rx.event
+    async def load_tasks(self):
+        self._column_limits = {}
+        await self._refresh_board()
 
     def toggle_add_task_modal(self):
         self.show_add_task_modal = not self.show_add_task_modal
 
-    def open_edit_task_modal(self, task_id: int):
+    async def open_edit_task_modal(self, task_id: int):
+        self.editing_task = await asyncio.to_thread(task_store.get_task, task_id)
+        if self.editing_task is None:
+            return
         self.editing_task_id = task_id
+        self.editing_history = []
+        await self._load_history_page()
         self.show_edit_task_modal = True
 
     def close_edit_task_modal(self):
         self.show_edit_task_modal = False
         self.editing_task_id = None
+        self.editing_task = None
+        self.editing_history = []
+        self.has_more_history = False
+
+    async def _load_history_page(self):
+        last = self.editing_history[-1] if self.editing_history else None
+        page = await asyncio.to_thread(
+            task_store.list_history,
+            self.editing_task_id,
+            before=(last["timestamp"], last["id"]) if last else None,
+            limit=HISTORY_PAGE_SIZE + 1,
+        )
+        self.has_more_history = len(page) > HISTORY_PAGE_SIZE
+        self.editing_history.extend(page[:HISTORY_PAGE_SIZE])
+
+    @rx.event
+    async def load_more_history(self):
+        if self.editing_task_id is not None and self.has_more_history:
+            await self._load_history_page()
+
+    def _parse_tags(self, raw_tags: str) -> list[str]:
+        return [tag.strip() for tag in raw_tags.split(",")] if raw_tags else []
 
     async def _log_history(self, task_id: int, action: str):
-        from app.states.auth_state import AuthState
-
-        auth_state = await self.get_state(AuthState)
-        user_email = auth_state.current_user_email
-        log = HistoryLog(
-            user=user_email,
-            action=action,
-            timestamp=datetime.datetime.now().isoformat(),
+        identity = await self.get_state(IdentityState)
+        log = await asyncio.to_thread(
+            task_store.append_history, task_id, identity.current_user_email, action
         )
-        for i, task in enumerate(self.tasks):
-            if task["id"] == task_id:
-                self.tasks[i]["history"].append(log)
-                break
+        if self.editing_task_id == task_id:
+            self.editing_history.insert(0, log)
 
     @rx.event
     async def add_task(self, form_data: dict):
-        new_id = max((t["id"] for t in self.tasks)) + 1 if self.tasks else 1
-        new_task: Task = {
-            "id": new_id,
-            "title": form_data["title"],
-            "description": form_data["description"],
-            "assignee": form_data["assignee"],
-            "due_date": form_data["due_date"],
-            "priority": form_data["priority"],
-            "tags": [tag.strip() for tag in form_data["tags"].split(",")]
-            if form_data["tags"]
-            else [],
-            "status": "To Do",
-            "attachments": [],
-            "comments": [],
-            "history": [],
-        }
-        self.tasks.append(new_task)
-        await self._log_history(new_id, "Created task")
+        new_task = await asyncio.to_thread(
+            task_store.create_task,
+            {
+                "title": form_data["title"],
+                "description": form_data["description"],
+                "assignee": form_data["assignee"],
+                "due_date": form_data["due_date"],
+                "priority": form_data["priority"],
+                "tags": self._parse_tags(form_data["tags"]),
+                "status": "To Do",
+                "attachments": [],
+            },
+        )
+        await self._refresh_board(tags_changed=bool(new_task["tags"]))
+        await self._log_history(new_task["id"], "Created task")
         self.show_add_task_modal = False
         yield rx.toast.success(f"Task '{new_task['title']}' added.")
 
+    async def _task_gone(self, task_id: int):
+        """Drop a task another session deleted or the archiver took away."""
+        archived = await asyncio.to_thread(task_store.is_archived, task_id)
+        if self.editing_task_id == task_id:
+            self.close_edit_task_modal()
+        await self._refresh_board()
+        return rx.toast.info(
+            "Task has been archived." if archived else "Task was deleted."
+        )
+
     @rx.event
     async def move_task(self, task_info: dict, new_status: str):
         task_id = task_info["item"]["id"]
-        for i, task in enumerate(self.tasks):
-            if task["id"] == task_id:
-                old_status = task["status"]
-                if old_status != new_status:
-                    self.tasks[i]["status"] = new_status
-                    await self._log_history(
-                        task_id, f"Moved from {old_status} to {new_status}"
-                    )
-                    yield rx.toast.info(f"Task moved to {new_status}")
-                return
+        old_status = await asyncio.to_thread(task_store.set_status, task_id, new_status)
+        if old_status is None:
+            yield await self._task_gone(task_id)
+            return
+        if old_status != new_status:
+            await self._refresh_board(tags_changed=False)
+            await self._log_history(task_id, f"Moved from {old_status} to {new_status}")
+            yield rx.toast.info(f"Task moved to {new_status}")
 
     @rx.event
     async def update_task(self, form_data: dict):
         if self.editing_task_id is None:
             return
-        for i, task in enumerate(self.tasks):
-            if task["id"] == self.editing_task_id:
-                self.tasks[i]["title"] = form_data["title"]
-                self.tasks[i]["description"] = form_data["description"]
-                self.tasks[i]["assignee"] = form_data["assignee"]
-                self.tasks[i]["due_date"] = form_data["due_date"]
-                self.tasks[i]["priority"] = form_data["priority"]
-                self.tasks[i]["tags"] = (
-                    [tag.strip() for tag in form_data["tags"].split(",")]
-                    if form_data["tags"]
-                    else []
-                )
-                await self._log_history(self.editing_task_id, "Updated task details")
-                yield rx.toast.success("Task updated.")
-                self.close_edit_task_modal()
-                return
+        previous_tags = self.editing_task["tags"] if self.editing_task else None
+        updated = await asyncio.to_thread(
+            task_store.update_task,
+            self.editing_task_id,
+            {
+                "title": form_data["title"],
+                "description": form_data["description"],
+                "assignee": form_data["assignee"],
+                "due_date": form_data["due_date"],
+                "priority": form_data["priority"],
+                "tags": self._parse_tags(form_data["tags"]),
+            },
+        )
+        if updated is None:
+            yield await self._task_gone(self.editing_task_id)
+            return
+        await self._refresh_board(tags_changed=updated["tags"] != previous_tags)
+        await self._log_history(self.editing_task_id, "Updated task details")
+        yield rx.toast.success("Task updated.")
+        self.close_edit_task_modal()
 
     @rx.event
     async def delete_task(self, task_id: int):
-        self.tasks = [t for t in self.tasks if t["id"] != task_id]
+        await asyncio.to_thread(task_store.delete_task, task_id)
+        await self._refresh_board()
         yield rx.toast.error("Task deleted.")
 
     @rx.event
     async def duplicate_task(self, task_id: int):
-        for task in self.tasks:
-            if task["id"] == task_id:
-                new_id = max((t["id"] for t in self.tasks)) + 1 if self.tasks else 1
-                new_task = task.copy()
-                new_task["id"] = new_id
-                new_task["title"] = f"{task['title']} (Copy)"
-                new_task["history"] = []
-                self.tasks.append(new_task)
-                await self._log_history(new_id, "Created task from duplicate")
-                yield rx.toast.info(f"Task '{task['title']}' duplicated.")
-                return
+        original = await asyncio.to_thread(task_store.get_task, task_id)
+        if original is None:
+            return
+        title = original["title"]
+        new_task = await asyncio.to_thread(
+            task_store.duplicate_task, task_id, f"{title} (Copy)"
+        )
+        if new_task is None:
+            return
+        # A copy repeats the original's tags, so the tag list cannot change.
+        await self._refresh_board(tags_changed=False)
+        await self._log_history(new_task["id"], "Created task from duplicate")
+        yield rx.toast.info(f"Task '{title}' duplicated.")
 
     @rx.event
     async def add_comment(self, form_data: dict):
         if self.editing_task_id is None or not form_data["comment_text"].strip():
             return
-        from app.states.auth_state import AuthState
-
-        auth_state = await self.get_state(AuthState)
-        for i, task in enumerate(self.tasks):
-            if task["id"] == self.editing_task_id:
-                new_comment = {
-                    "author": auth_state.current_user_email,
-                    "text": form_data["comment_text"],
-                    "timestamp": datetime.datetime.now().isoformat(),
-                }
-                self.tasks[i]["comments"].append(new_comment)
-                await self._log_history(self.editing_task_id, "Added a comment")
-                yield rx.toast.success("Comment added.")
-                return
-
-    @rx.var
-    def due_today_count(self) -> int:
-        today = datetime.date.today().isoformat()
-        return sum(
-            (
-                1
-                for task in self.tasks
-                if task["due_date"] == today and task["status"] != "Done"
-            )
-        )
\ No newline at end of file
+        identity = await self.get_state(IdentityState)
+        new_comment = await asyncio.to_thread(
+            task_store.add_comment,
+            self.editing_task_id,
+            identity.current_user_email,
+            form_data["comment_text"],
+        )
+        if new_comment is None:
+            yield await self._task_gone(self.editing_task_id)
+            return
+        # Refreshes the comment count, and the comment may match the search.
+        await self._refresh_columns()
+        if self.editing_task is not None:
+            self.editing_task["comments"].append(new_comment)
+        await self._log_history(self.editing_task_id, "Added a comment")
+        yield rx.toast.success("Comment added.")
+
+    def toggle_archive_modal(self):
+        self.show_archive_modal = not self.show_archive_modal
+        if self.show_archive_modal:
+            return KanbanState.search_archive(self.archive_query)
+
+    @rx.event
+    async def search_archive(self, query: str):
+        self.archive_query = query
+        self.archive_results = await asyncio.to_thread(
+            task_store.search_archive, query.strip()
+        )
+
+    @rx.event
+    async def reopen_archived_task(self, task_id: int):
+        restored = await asyncio.to_thread(task_store.restore_task, task_id)
+        if restored is None:
+            return
+        await self._refresh_board()
+        await self._log_history(task_id, "Reopened from archive")
+        self.archive_results = [t for t in self.archive_results if t["id"] != task_id]
+        yield rx.toast.success(f"Task '{restored['title']}' reopened.")
@@ -1,6 +1,9 @@
 import reflex as rx
 from typing import Literal, TypedDict
-from app.states.auth_state import AuthState
+from app.services.session_store import session_store
+from app.services.user_store import user_store
+from app.states.auth_state import AuthState, validate_password
+from app.states.identity_state import IdentityState
 
 
 class SettingsState(rx.State):
@@ -25,11 +28,11 @@ class SettingsState(rx.State):
 
     @rx.event
     async def load_user_settings(self):
-        auth_state = await self.get_state(AuthState)
-        if auth_state.current_user:
-            user = auth_state.current_user
-            self.language = user.get("language", "Portugués (Brasil)")
-            self.timezone = user.get("timezone", "(GMT-03:00) Brasilía")
+        identity = await self.get_state(IdentityState)
+        if identity.current_user_email:
+            self.language = identity.language
+            self.timezone = identity.timezone
+        self.session_expiration = session_store.lifetime_hours()
 
     def set_active_tab(self, tab_name: str):
         self.active_tab = tab_name
@@ -38,14 +41,18 @@ class SettingsState(rx.State):
     async def save_profile_settings(self, form_data: dict):
         auth_state = await self.get_state(AuthState)
         if auth_state.current_user:
-            user = auth_state.current_user
-            user["full_name"] = form_data["full_name"]
-            user["department"] = form_data["department"]
-            user["language"] = form_data["language"]
-            user["timezone"] = form_data["timezone"]
-            self.language = user["language"]
-            self.timezone = user["timezone"]
-            auth_state.users[auth_state.current_user_email] = user
+            await user_store.update_user(
+                auth_state.current_user_email,
+                {
+                    "full_name": form_data["full_name"],
+                    "department": form_data["department"],
+                    "language": form_data["language"],
+                    "timezone": form_data["timezone"],
+                },
+            )
+            await auth_state._user_changed(auth_state.current_user_email)
+            self.language = form_data["language"]
+            self.timezone = form_data["timezone"]
             yield rx.toast.success("Perfil salvo com sucesso!")
 
     @rx.event
@@ -53,20 +60,19 @@ class SettingsState(rx.State):
         current_password = form_data["current_password"]
         new_password = form_data["new_password"]
         confirm_password = form_data["confirm_password"]
-        auth_state = await self.get_state(AuthState)
-        if auth_state.current_user:
-            user = auth_state.current_user
-            if user["password"] != current_password:
+        identity = await self.get_state(IdentityState)
+        if identity.current_user_email:
+            email = identity.current_user_email
+            if await user_store.check_password(email, current_password) is None:
                 yield rx.toast.error("Senha atual incorreta.")
                 return
             if new_password != confirm_password:
                 yield rx.toast.error("As novas senhas não coincidem.")
                 return
-            if not auth_state._validate_password(new_password):
+            if not validate_password(new_password):
                 yield rx.toast.error("A nova senha não é forte o suficiente.")
                 return
-            user["password"] = new_password
-            auth_state.users[auth_state.current_user_email] = user
+            await user_store.update_user(email, {"password": new_password})
             yield rx.toast.success("Senha alterada com sucesso!")
 
     @rx.event
@@ -90,6 +96,14 @@ class SettingsState(rx.State):
         yield rx.toast.success("Integrações salvas com sucesso!")
 
     @rx.event
-    def save_admin_settings(self, form_data: dict):
-        self.session_expiration = int(form_data["session_expiration"])
+    async def save_admin_settings(self, form_data: dict):
+        identity = await self.get_state(IdentityState)
+        if not identity._is_admin():
+            return
+        hours = int(form_data["session_expiration"])
+        if hours < 1:
+            yield rx.toast.error("A expiração deve ser de pelo menos 1 hora.")
+            return
+        session_store.set_lifetime_hours(hours)
+        self.session_expiration = hours
         yield rx.toast.success("Configurações de administrador salvas!")
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""Login throughput at different scrypt cost factors.
+
+Run from the repository root:
+
+    python -m benchmarks.password_hashing [--seconds 3] [--workers 1 2 4]
+
+For each cost factor ``n`` it reports the single-hash latency, the number of
+verifications per second the password pool sustains, and the worst event-loop
+stall seen while the pool was saturated. That stall should stay near the
+sleep resolution, because hashing never runs on the loop.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.passwords import SCRYPT_P, SCRYPT_R, hash_password, verify_password
+
+PASSWORD = "Password123!"
+
+
+async def _loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def _throughput(stored: str, workers: int, seconds: float) -> tuple[int, float]:
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    deadline = time.perf_counter() + seconds
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        async def login():
+            nonlocal done
+            while time.perf_counter() < deadline:
+                await loop.run_in_executor(executor, verify_password, PASSWORD, stored)
+                done += 1
+
+        lag = asyncio.create_task(_loop_lag(stop))
+        await asyncio.gather(*(login() for _ in range(workers)))
+        stop.set()
+        return done, await lag
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument(
+        "--log2-n", type=int, nargs="+", default=[12, 13, 14, 15, 16]
+    )
+    args = parser.parse_args()
+
+    print(f"scrypt r={SCRYPT_R} p={SCRYPT_P}, {os.cpu_count()} CPUs")
+    print(f"{'n':>8} {'hash ms':>9} {'workers':>8} {'logins/s':>9} {'max lag ms':>11}")
+    for log2_n in args.log2_n:
+        n = 2**log2_n
+        started = time.perf_counter()
+        stored = hash_password(PASSWORD, n=n)
+        hash_ms = (time.perf_counter() - started) * 1000
+        for workers in args.workers:
+            done, lag = asyncio.run(_throughput(stored, workers, args.seconds))
+            print(
+                f"{n:>8} {hash_ms:>9.1f} {workers:>8}"
+                f" {done / args.seconds:>9.1f} {lag * 1000:>11.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
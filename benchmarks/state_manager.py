@@ -0,0 +1,223 @@
+"""Per-event latency of move_task and send_message on each state manager.
+
+Run from the repository root:
+
+    python -m benchmarks.state_manager [--clients 20] [--events 50]
+        [--backends memory disk redis] [--redis-url redis://localhost:6379/15]
+
+"redis" needs a throwaway Redis-compatible server, for example
+``valkey-server --port 6379 --save ''``; "fakeredis" runs against the
+in-process stand-in from the ``fakeredis`` package instead. Each simulated
+client fires its events from ``--overlap`` tasks at once, like a double click
+or a background listener racing a user event, so the per-client lock sees
+real contention. Every event goes through ``modify_state`` exactly as the app
+does: acquire the lock, load the state, run the handler, write the state back.
+The tasks and messages it creates go to a scratch database.
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault(
+    "CHAT_KANBAN_DB", os.path.join(tempfile.mkdtemp(), "benchmark.db")
+)
+
+import argparse
+import asyncio
+import inspect
+import statistics
+import time
+
+import reflex as rx
+import reflex.state
+
+# reflex.state must load first: importing reflex.istate.manager on its own hits
+# a circular import on LockExpiredError.
+from reflex.constants import RouteVar
+from reflex.istate.data import RouterData
+from reflex.state import _substate_key
+from reflex.istate.manager import (
+    StateManagerDisk,
+    StateManagerMemory,
+    StateManagerRedis,
+)
+
+from app.services.state_metrics import LockMetrics, instrument_state_manager
+from app.states.auth_state import AuthState
+from app.states.chat_state import ChatState
+from app.states.kanban_state import KanbanState
+
+SENDER = "admin@example.com"
+RECIPIENT = "jane.doe@example.com"
+
+
+def _create_manager(backend: str, redis_url: str):
+    if backend == "memory":
+        return StateManagerMemory(state=rx.State)
+    if backend == "disk":
+        return StateManagerDisk(state=rx.State)
+    if backend == "redis":
+        import redis.asyncio as redis
+
+        return StateManagerRedis(state=rx.State, redis=redis.Redis.from_url(redis_url))
+    if backend == "fakeredis":
+        from fakeredis import FakeAsyncRedis
+
+        return StateManagerRedis(state=rx.State, redis=FakeAsyncRedis())
+    raise ValueError(f"Unknown backend {backend!r}")
+
+
+async def _call(handler, state, *args):
+    result = handler.fn(state, *args)
+    if inspect.isasyncgen(result):
+        async for _ in result:
+            pass
+    elif inspect.isawaitable(result):
+        await result
+
+
+def _use_manager(manager):
+    """Stand in for the app: states that ``get_state`` a sibling which is not
+    loaded yet fetch it from the app's state manager, and there is no app."""
+    reflex.state.get_state_manager = lambda: manager
+
+
+def _route(root, token: str):
+    """Attach the client token the way the app does for each event."""
+    router_data = {RouteVar.CLIENT_TOKEN: token}
+    if root.router_data != router_data:
+        root.router_data = router_data
+        root.router = RouterData.from_router_data(router_data)
+
+
+async def _sign_in(manager, token: str):
+    async with manager.modify_state(_substate_key(token, AuthState)) as root:
+        _route(root, token)
+        auth = await root.get_state(AuthState)
+        auth.current_user_email = SENDER
+        auth.in_session = True
+        await auth._load_current_user()
+        kanban = await root.get_state(KanbanState)
+        await _call(KanbanState.load_tasks, kanban)
+        chat = await root.get_state(ChatState)
+        chat.active_chat_with = RECIPIENT
+        await _call(ChatState.load_chat, chat)
+        columns = (kanban.todo_cards, kanban.in_progress_cards, kanban.done_cards)
+        task_ids = [card["id"] for cards in columns for card in cards]
+        return task_ids, list(kanban.columns)
+
+
+async def _event(manager, token: str, state_cls, handler, *args) -> float:
+    started = time.perf_counter()
+    async with manager.modify_state(_substate_key(token, state_cls)) as root:
+        _route(root, token)
+        await _call(handler, await root.get_state(state_cls), *args)
+    return time.perf_counter() - started
+
+
+async def _client(manager, token: str, handler_name: str, events: int, overlap: int):
+    task_ids, columns = await _sign_in(manager, token)
+    latencies = []
+
+    async def worker(offset: int):
+        for i in range(offset, events, overlap):
+            if handler_name == "move_task":
+                task_info = {"item": {"id": task_ids[i % len(task_ids)]}}
+                status = columns[i % len(columns)]
+                latency = await _event(
+                    manager,
+                    token,
+                    KanbanState,
+                    KanbanState.move_task,
+                    task_info,
+                    status,
+                )
+            else:
+                latency = await _event(
+                    manager,
+                    token,
+                    ChatState,
+                    ChatState.send_message,
+                    {"message": f"benchmark message {i}"},
+                )
+            latencies.append(latency)
+
+    await asyncio.gather(*(worker(offset) for offset in range(overlap)))
+    return latencies
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float, float]:
+    if len(samples) < 2:
+        value = samples[0] if samples else 0.0
+        return value, value, value
+    q = statistics.quantiles(samples, n=100)
+    return q[49], q[94], q[98]
+
+
+async def _run(backend: str, handler_name: str, args) -> str:
+    manager = _create_manager(backend, args.redis_url)
+    _use_manager(manager)
+    metrics = LockMetrics(keep_samples=True)
+    instrument_state_manager(manager, metrics)
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(
+            _client(
+                manager,
+                # Reflex splits state keys at the first underscore.
+                f"bench-{backend}-{handler_name.replace('_', '-')}-{n}",
+                handler_name,
+                args.events,
+                args.overlap,
+            )
+            for n in range(args.clients)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    # Only the Redis manager holds a connection to close.
+    if hasattr(manager, "close"):
+        await manager.close()
+
+    latencies = [latency for result in results for latency in result]
+    p50, p95, p99 = _percentiles(latencies)
+    stats = metrics.snapshot()
+    acquisitions = sum(s.acquisitions for s in stats.values())
+    contended = sum(s.contended for s in stats.values())
+    waits = [wait for s in stats.values() for wait in s.waits]
+    return (
+        f"{backend:>10} {handler_name:>13} {p50 * 1000:>8.2f} {p95 * 1000:>8.2f}"
+        f" {p99 * 1000:>8.2f} {len(latencies) / elapsed:>9.1f}"
+        f" {contended / max(1, acquisitions):>10.1%}"
+        f" {_percentiles(waits)[1] * 1000:>12.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument("--overlap", type=int, default=2)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=["memory", "disk"],
+        choices=["memory", "disk", "redis", "fakeredis"],
+    )
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    args = parser.parse_args()
+
+    print(
+        f"{args.clients} clients x {args.events} events,"
+        f" {args.overlap} in flight per client"
+    )
+    print(
+        f"{'backend':>10} {'handler':>13} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+        f" {'events/s':>9} {'contended':>10} {'wait p95 ms':>12}"
+    )
+    for backend in args.backends:
+        for handler_name in ("move_task", "send_message"):
+            print(asyncio.run(_run(backend, handler_name, args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,42 @@
+import os
+
 import reflex as rx
+from reflex.constants import StateManagerMode
+
+# Any Redis-compatible server (Redis, Valkey, a local stand-in) holds the
+# state so several backend workers can share it. "disk://" is Reflex's default
+# single-process manager, which also pickles each state to .states/ so it
+# survives a restart; "memory://" keeps state in process memory only.
+STATE_MANAGER_URL = os.environ.get("STATE_MANAGER_URL") or "disk://"
+
+if STATE_MANAGER_URL == "memory://":
+    state_manager_options = {"state_manager_mode": StateManagerMode.MEMORY}
+elif STATE_MANAGER_URL == "disk://":
+    state_manager_options = {"state_manager_mode": StateManagerMode.DISK}
+elif STATE_MANAGER_URL.startswith(("redis://", "rediss://", "unix://")):
+    state_manager_options = {
+        "state_manager_mode": StateManagerMode.REDIS,
+        "redis_url": STATE_MANAGER_URL,
+        "redis_lock_expiration": int(
+            os.environ.get("STATE_LOCK_EXPIRATION_MS", "10000")
+        ),
+        "redis_lock_warning_threshold": int(
+            os.environ.get("STATE_LOCK_WARNING_MS", "1000")
+        ),
+        "redis_token_expiration": int(
+            os.environ.get("STATE_TOKEN_EXPIRATION_SECONDS", "3600")
+        ),
+    }
+else:
+    # A typo would otherwise fall back to the single-process default and
+    # quietly stop sharing state between workers.
+    raise ValueError(
+        f"Unrecognized STATE_MANAGER_URL {STATE_MANAGER_URL!r}; expected"
+        " memory://, disk://, redis://, rediss:// or unix://"
+    )
 
-config = rx.Config(app_name="app", plugins=[rx.plugins.TailwindV3Plugin()])
+config = rx.Config(
+    app_name="app",
+    plugins=[rx.plugins.TailwindV3Plugin()],
+    **state_manager_options,
+)
@@ -0,0 +1,86 @@
+import asyncio
+import inspect
+import os
+import tempfile
+
+# The stores open the database named here when they are first imported.
+os.environ.setdefault(
+    "CHAT_KANBAN_DB", os.path.join(tempfile.mkdtemp(), "chat_kanban.db")
+)
+
+import pytest
+import reflex as rx
+
+from app.services.database import database
+from app.services.session_store import session_store
+from app.services.user_directory import user_directory
+from app.states.auth_state import AuthState
+
+
+@pytest.fixture(autouse=True)
+def fresh_database(tmp_path):
+    """Give every test its own seeded database file."""
+    database.close()
+    database.path = str(tmp_path / "chat_kanban.db")
+    user_directory.invalidate()
+    yield
+    database.close()
+
+
+class Session:
+    """One browser tab: a full Reflex state tree driven without a server."""
+
+    def __init__(self):
+        self.root = rx.State(_reflex_internal_init=True)
+
+    def state(self, state_cls: type[rx.State]):
+        return self.root.get_substate(state_cls.get_full_name().split(".")[1:])
+
+    def run(self, handler, *args) -> list:
+        """Run an event handler to completion and return what it yielded."""
+        state = self.state(_owner(handler))
+        return asyncio.run(_drain(handler.fn(state, *args)))
+
+    def sign_in(self, email: str = "admin@example.com") -> "Session":
+        self.state(AuthState).session_token = session_store.create(email)
+        self.run(AuthState.check_session)
+        return self
+
+
+def _owner(handler) -> type[rx.State]:
+    return next(
+        state_cls
+        for state_cls in _all_states(rx.State)
+        if state_cls.get_full_name() == handler.state_full_name
+    )
+
+
+def _all_states(state_cls):
+    yield state_cls
+    for substate in state_cls.get_substates():
+        yield from _all_states(substate)
+
+
+async def _drain(result) -> list:
+    if inspect.isasyncgen(result):
+        return [event async for event in result]
+    if inspect.isgenerator(result):
+        return list(result)
+    if inspect.isawaitable(result):
+        result = await result
+    return [] if result is None else [result]
+
+
+@pytest.fixture
+def anonymous_session():
+    return Session()
+
+
+@pytest.fixture
+def session():
+    return Session().sign_in()
+
+
+@pytest.fixture
+def make_session():
+    return lambda email="admin@example.com": Session().sign_in(email)
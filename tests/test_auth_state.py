@@ -0,0 +1,83 @@
+import reflex as rx
+
+from app.states.auth_state import AuthState
+from app.states.identity_state import IdentityState
+from app.states.kanban_state import KanbanState
+
+
+def emails(auth) -> list[str]:
+    return [user["email"] for user in auth.filtered_users]
+
+
+def test_directory_pages_come_from_the_shared_index(make_session):
+    admin = make_session()
+    admin.run(AuthState.load_user_directory)
+    auth = admin.state(AuthState)
+    assert emails(auth) == [
+        "admin@example.com",
+        "jane.doe@example.com",
+        "john.smith@example.com",
+    ]
+    assert auth.all_departments == ["Engineering", "Management", "Marketing"]
+    assert "_users" not in AuthState.backend_vars
+
+    admin.run(
+        AuthState.create_user,
+        {
+            "full_name": "Ana Lima",
+            "email": "ana.lima@example.com",
+            "department": "Sales",
+            "role": "Standard",
+            "password": "Password123!",
+            "confirm_password": "Password123!",
+        },
+    )
+    assert emails(auth)[1] == "ana.lima@example.com"
+
+    other_admin = make_session()
+    other_admin.run(AuthState.load_user_directory)
+    assert other_admin.state(AuthState).user_total == 4
+
+
+def test_standard_users_get_no_directory(make_session):
+    jane = make_session("jane.doe@example.com")
+    jane.run(AuthState.load_user_directory)
+    auth = jane.state(AuthState)
+    assert auth.filtered_users == []
+
+    for handler, *args in (
+        (AuthState.set_search_query, ""),
+        (AuthState.set_department_filter, "Management"),
+        (AuthState.set_user_sort, "role"),
+        (AuthState.set_user_page, 0),
+        (AuthState.set_user_page_size, "100"),
+    ):
+        jane.run(handler, *args)
+        assert auth.filtered_users == [] and auth.user_total == 0
+
+    jane.run(AuthState.open_user_modal, "admin@example.com")
+    assert auth.modal_form_data == {} and not auth.show_user_modal
+
+
+def test_identity_is_a_sibling_that_auth_keeps_current(make_session):
+    assert IdentityState.get_parent_state() is rx.State
+    assert AuthState not in IdentityState.get_substates()
+
+    jane = make_session("jane.doe@example.com")
+    identity = jane.state(IdentityState)
+    assert (identity.current_user_email, identity.role) == (
+        "jane.doe@example.com",
+        "Standard",
+    )
+
+    jane.run(AuthState.sign_out)
+    assert identity.current_user_email == ""
+
+
+def test_kanban_cards_name_assignees_without_auth_state(session):
+    session.run(KanbanState.load_tasks)
+    names = {
+        card["assignee_name"]
+        for card in session.state(KanbanState).in_progress_cards
+    }
+    assert "Jane Doe" in names
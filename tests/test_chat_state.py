@@ -0,0 +1,110 @@
+from app.services import chat_store as chat_store_module
+from app.services.chat_store import MESSAGE_PAGE_SIZE, chat_store
+from app.states.chat_state import ChatState
+
+
+def test_send_message_needs_a_session_and_a_known_recipient(
+    anonymous_session, make_session
+):
+    anonymous = anonymous_session
+    anonymous.state(ChatState).active_chat_with = "jane.doe@example.com"
+    anonymous.run(ChatState.send_message, {"message": "hi"})
+
+    admin = make_session()
+    admin.state(ChatState).active_chat_with = "nobody@example.com"
+    events = admin.run(ChatState.send_message, {"message": "hi"})
+
+    assert "Contato não encontrado." in str(events)
+    assert chat_store.search_messages("jane.doe@example.com", "hi") == []
+    assert chat_store.search_messages("nobody@example.com", "hi") == []
+
+
+def message_ids(chat) -> list[int]:
+    return [message["id"] for message in chat.current_chat_messages]
+
+
+def test_opening_a_chat_loads_only_that_conversation(session):
+    session.run(ChatState.load_chat)
+    assert message_ids(session.state(ChatState)) == [1, 2, 3]
+
+    session.run(ChatState.set_active_chat, "john.smith@example.com")
+    assert message_ids(session.state(ChatState)) == [4]
+
+
+def send(sender: str, receiver: str, count: int, text: str = "message {n}"):
+    for n in range(count):
+        chat_store.add_message(sender, receiver, text.format(n=n))
+
+
+def test_history_pages_backwards_from_the_newest_message(session):
+    send("jane.doe@example.com", "admin@example.com", 70)
+    session.run(ChatState.load_chat)
+    chat = session.state(ChatState)
+    assert len(chat.current_chat_messages) == MESSAGE_PAGE_SIZE
+    assert chat.has_older_messages
+
+    while chat.has_older_messages:
+        session.run(ChatState.load_older_messages)
+
+    ids = message_ids(chat)
+    assert ids == sorted(set(ids)) and len(ids) == 73
+    assert ids[0] == 1
+
+
+def test_message_times_follow_each_viewers_timezone(
+    session, make_session, monkeypatch
+):
+    # 2024-01-15 15:00 UTC.
+    monkeypatch.setattr(chat_store_module, "now_ms", lambda: 1705330800000)
+    message = chat_store.add_message(
+        "jane.doe@example.com", "admin@example.com", "timezones"
+    )
+    jane = make_session("jane.doe@example.com")
+    jane.state(ChatState).active_chat_with = "admin@example.com"
+
+    session.run(ChatState.load_chat)
+    jane.run(ChatState.load_chat)
+
+    def shown(viewer):
+        chat = viewer.state(ChatState)
+        (entry,) = [m for m in chat.current_chat_messages if m["id"] == message["id"]]
+        return entry["display_time"]
+
+    assert shown(session) == "15 Jan, 12:00 PM"
+    assert shown(jane) == "15 Jan, 07:00 AM"
+
+
+def test_opening_a_conversation_clears_its_unread_count(session):
+    session.state(ChatState).active_chat_with = "john.smith@example.com"
+    send("jane.doe@example.com", "admin@example.com", 2)
+    session.run(ChatState.load_chat)
+    chat = session.state(ChatState)
+    assert chat.contact_summaries["jane.doe@example.com"]["unread"] == 3
+    assert chat.contact_summaries["john.smith@example.com"]["unread"] == 0
+
+    session.run(ChatState.set_active_chat, "jane.doe@example.com")
+    assert chat.contact_summaries["jane.doe@example.com"]["unread"] == 0
+
+    session.run(ChatState.load_chat)
+    assert chat.contact_summaries["jane.doe@example.com"]["unread"] == 0
+
+
+def test_opening_a_search_hit_jumps_to_that_message(session):
+    needle = chat_store.add_message(
+        "jane.doe@example.com", "admin@example.com", "the needle"
+    )
+    send("jane.doe@example.com", "admin@example.com", 2 * MESSAGE_PAGE_SIZE)
+    session.state(ChatState).active_chat_with = "john.smith@example.com"
+
+    session.run(ChatState.search_messages, "needle")
+    chat = session.state(ChatState)
+    (hit,) = chat.search_results
+    assert hit["id"] == needle["id"]
+
+    events = session.run(ChatState.open_search_hit, hit["peer"], hit["id"])
+    assert chat.active_chat_with == "jane.doe@example.com"
+    assert chat.highlighted_message_id == needle["id"]
+    assert needle["id"] in message_ids(chat)
+    assert chat.has_newer_messages
+    (scroll,) = events
+    assert f'getElementById("message-{needle["id"]}")' in repr(scroll)
@@ -0,0 +1,20 @@
+from app.services.chat_store import chat_store
+
+
+def test_search_messages_only_ranks_the_users_own_messages():
+    chat_store.add_message("ana@example.com", "bob@example.com", "landing copy ready")
+    chat_store.add_message("jane.admin@example.com", "bob@example.com", "landing")
+
+    hits = chat_store.search_messages("admin@example.com", "land")
+    assert [hit["id"] for hit in hits] == [1]
+    hits = chat_store.search_messages("bob@example.com", "landing")
+    peers = {hit["peer"] for hit in hits}
+    assert peers == {"ana@example.com", "jane.admin@example.com"}
+    assert chat_store.search_messages("john.smith@example.com", "landing") == []
+
+
+def test_search_terms_do_not_match_participant_tokens():
+    email = "admin@example.com"
+    token_prefix = email.encode().hex()[:4]
+
+    assert chat_store.search_messages(email, token_prefix) == []
@@ -0,0 +1,146 @@
+from app.services.task_store import CARD_PAGE_SIZE, task_store
+from app.states.kanban_state import KanbanState
+
+
+def card_ids(kanban) -> list[int]:
+    return [
+        card["id"]
+        for cards in (kanban.todo_cards, kanban.in_progress_cards, kanban.done_cards)
+        for card in cards
+    ]
+
+
+def test_delete_during_search_then_clear_filter(session):
+    session.run(KanbanState.load_tasks)
+    session.run(KanbanState.set_search_query, "landing")
+    assert card_ids(session.state(KanbanState)) == [1]
+
+    session.run(KanbanState.delete_task, 1)
+    session.run(KanbanState.set_tag_filter, "All")
+
+    kanban = session.state(KanbanState)
+    assert card_ids(kanban) == []
+    assert sum(kanban.column_counts.values()) == 0
+
+
+def test_search_matches_task_created_by_another_session(make_session):
+    viewer = make_session()
+    viewer.run(KanbanState.load_tasks)
+    author = make_session("jane.doe@example.com")
+    author.run(KanbanState.load_tasks)
+    author.run(
+        KanbanState.add_task,
+        {
+            "title": "Quarterly roadmap review",
+            "description": "",
+            "assignee": "jane.doe@example.com",
+            "due_date": "2024-09-30",
+            "priority": "Low",
+            "tags": "",
+        },
+    )
+
+    viewer.run(KanbanState.set_search_query, "roadmap")
+
+    kanban = viewer.state(KanbanState)
+    assert [card["title"] for card in kanban.todo_cards] == ["Quarterly roadmap review"]
+    assert kanban.column_counts == {"To Do": 1, "In Progress": 0, "Done": 0}
+
+
+def test_move_task_deleted_by_another_session(make_session):
+    mover = make_session()
+    mover.run(KanbanState.load_tasks)
+    make_session("jane.doe@example.com").run(KanbanState.delete_task, 1)
+
+    events = mover.run(KanbanState.move_task, {"item": {"id": 1}}, "Done")
+
+    assert "Task was deleted." in str(events)
+    assert 1 not in card_ids(mover.state(KanbanState))
+
+
+def add_task_form(**fields) -> dict:
+    return {
+        "title": "Untitled",
+        "description": "",
+        "assignee": "admin@example.com",
+        "due_date": "2024-09-30",
+        "priority": "Low",
+        "tags": "",
+        **fields,
+    }
+
+
+def test_load_more_cards_extends_the_window_without_gaps(session):
+    for n in range(30):
+        task_store.create_task(
+            {**add_task_form(title=f"Item {n}"), "tags": [], "status": "To Do"}
+        )
+    session.run(KanbanState.load_tasks)
+    kanban = session.state(KanbanState)
+    assert len(kanban.todo_cards) == CARD_PAGE_SIZE
+    assert kanban.column_counts["To Do"] == 32
+
+    session.run(KanbanState.load_more_cards, "To Do")
+    todo = [card["id"] for card in kanban.todo_cards]
+    assert todo == sorted(set(todo)) and len(todo) == 32
+
+    # Later refreshes keep the window the user scrolled to.
+    session.run(KanbanState.move_task, {"item": {"id": 4}}, "Done")
+    assert len(kanban.todo_cards) == 31
+    assert kanban.column_counts == {"To Do": 31, "In Progress": 2, "Done": 2}
+
+
+def test_filters_narrow_windows_and_counts_together(session):
+    session.run(KanbanState.load_tasks)
+    session.run(KanbanState.set_assignee_filter, "jane.doe@example.com")
+    kanban = session.state(KanbanState)
+    assert card_ids(kanban) == [1, 2]
+    assert kanban.in_progress_cards[0]["assignee_name"] == "Jane Doe"
+
+    session.run(KanbanState.set_tag_filter, "Security")
+    assert card_ids(kanban) == [2]
+    assert sum(kanban.column_counts.values()) == 1
+
+    session.run(KanbanState.set_assignee_filter, "All")
+    session.run(KanbanState.set_tag_filter, "All")
+    assert sum(kanban.column_counts.values()) == len(card_ids(kanban)) == 5
+
+
+def test_each_event_picks_up_other_sessions_writes(make_session):
+    viewer = make_session()
+    viewer.run(KanbanState.load_tasks)
+    other = make_session("jane.doe@example.com")
+    other.run(KanbanState.load_tasks)
+    other.run(KanbanState.move_task, {"item": {"id": 5}}, "In Progress")
+    other.run(KanbanState.add_task, add_task_form(tags="Zeta"))
+
+    viewer.run(KanbanState.move_task, {"item": {"id": 4}}, "Done")
+
+    kanban = viewer.state(KanbanState)
+    assert [card["id"] for card in kanban.in_progress_cards] == [1, 2, 5]
+    assert kanban.column_counts == {"To Do": 1, "In Progress": 3, "Done": 2}
+    # Tags are only re-read when this session's own write touched them.
+    assert "Zeta" not in kanban.all_tags
+    viewer.run(KanbanState.load_tasks)
+    assert "Zeta" in kanban.all_tags
+
+
+def test_edits_to_a_task_deleted_elsewhere_close_the_modal(make_session):
+    editor = make_session()
+    editor.run(KanbanState.load_tasks)
+    editor.run(KanbanState.open_edit_task_modal, 1)
+    make_session("jane.doe@example.com").run(KanbanState.delete_task, 1)
+
+    events = editor.run(KanbanState.add_comment, {"comment_text": "still here?"})
+    assert "Task was deleted." in str(events)
+    kanban = editor.state(KanbanState)
+    assert not kanban.show_edit_task_modal and kanban.editing_task_id is None
+
+    editor.run(KanbanState.open_edit_task_modal, 2)
+    make_session("jane.doe@example.com").run(KanbanState.delete_task, 2)
+    events = editor.run(
+        KanbanState.update_task, add_task_form(title="Renamed", tags="Backend")
+    )
+    assert "Task was deleted." in str(events)
+    assert not kanban.show_edit_task_modal
+    assert 2 not in card_ids(kanban)
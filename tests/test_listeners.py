@@ -0,0 +1,56 @@
+import asyncio
+
+from app.services import listeners as listeners_module
+from app.services.listeners import ListenerRegistry
+from app.services.message_bus import message_bus
+from app.services.presence import presence
+
+
+async def _collect(registry, email, token, received):
+    async with registry.listen("chat", token, email, "test") as messages:
+        async for message in messages:
+            received.append(message)
+
+
+def test_listener_exits_when_its_tab_stops_heartbeating(monkeypatch):
+    monkeypatch.setattr(listeners_module, "LIVENESS_CHECK_SECONDS", 0.01)
+    registry = ListenerRegistry()
+
+    async def scenario():
+        presence.heartbeat("admin@example.com", "tab-1")
+        assert registry.claim("chat", "tab-1", "admin@example.com")
+        assert not registry.claim("chat", "tab-1", "admin@example.com")
+        received = []
+        listener = asyncio.create_task(
+            _collect(registry, "admin@example.com", "tab-1", received)
+        )
+        await asyncio.sleep(0.05)
+        await message_bus.publish("test", {"id": 1})
+        await asyncio.sleep(0.05)
+        assert received == [{"id": 1}]
+
+        presence.disconnect("admin@example.com", "tab-1")
+        await asyncio.wait_for(listener, timeout=1)
+        # Nothing is left behind, so the next page load starts a new one.
+        assert registry.claim("chat", "tab-1", "admin@example.com")
+
+    asyncio.run(scenario())
+
+
+def test_listener_exits_when_another_user_claims_the_tab(monkeypatch):
+    monkeypatch.setattr(listeners_module, "LIVENESS_CHECK_SECONDS", 0.01)
+    registry = ListenerRegistry()
+
+    async def scenario():
+        presence.heartbeat("admin@example.com", "tab-1")
+        registry.claim("chat", "tab-1", "admin@example.com")
+        listener = asyncio.create_task(
+            _collect(registry, "admin@example.com", "tab-1", [])
+        )
+        await asyncio.sleep(0.05)
+        assert registry.claim("chat", "tab-1", "jane.doe@example.com")
+        await message_bus.publish("test", {"id": 1})
+        await asyncio.wait_for(listener, timeout=1)
+        assert registry.is_running("chat", "tab-1", "jane.doe@example.com")
+
+    asyncio.run(scenario())
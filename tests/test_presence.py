@@ -0,0 +1,35 @@
+import asyncio
+
+from app.services.presence import PresenceService, presence
+from app.states.identity_state import IdentityState
+
+
+def test_flush_reports_who_came_online_and_went_offline():
+    service = PresenceService(presence.pool)
+    service.heartbeat("jane.doe@example.com", "tab-1")
+    service.heartbeat("jane.doe@example.com", "tab-2")
+
+    assert service.is_connected("jane.doe@example.com", "tab-1")
+    assert asyncio.run(service.flush()) == ({"jane.doe@example.com"}, set())
+    assert service.online_users() == {"jane.doe@example.com"}
+
+    service.disconnect("jane.doe@example.com", "tab-1")
+    assert not service.is_connected("jane.doe@example.com", "tab-1")
+    assert asyncio.run(service.flush()) == (set(), set())
+    assert service.is_connected("jane.doe@example.com", "tab-2")
+
+    service.disconnect("jane.doe@example.com", "tab-2")
+    assert asyncio.run(service.flush()) == (set(), {"jane.doe@example.com"})
+    assert service.online_users() == set()
+
+
+def test_heartbeats_come_from_signed_in_tabs_only(session, anonymous_session):
+    token = session.state(IdentityState).router.session.client_token
+    presence.disconnect("admin@example.com", token)
+
+    anonymous_session.run(IdentityState.presence_heartbeat)
+    anonymous_token = anonymous_session.state(IdentityState).router.session.client_token
+    assert not presence.is_connected("", anonymous_token)
+
+    session.run(IdentityState.presence_heartbeat)
+    assert presence.is_connected("admin@example.com", token)
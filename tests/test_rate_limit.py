@@ -0,0 +1,30 @@
+import asyncio
+
+from app.services.rate_limit import InProcessRateLimiter, TokenBucket
+
+BUCKET = TokenBucket(capacity=2, refill_per_second=1 / 60)
+
+
+def test_bucket_allows_a_burst_then_asks_to_wait():
+    limiter = InProcessRateLimiter()
+
+    async def attempts():
+        return [await limiter.consume("login:account:a", BUCKET) for _ in range(3)]
+
+    first, second, third = asyncio.run(attempts())
+    assert first == second == 0
+    assert 59 < third <= 60
+
+    asyncio.run(limiter.reset("login:account:a"))
+    assert asyncio.run(limiter.consume("login:account:a", BUCKET)) == 0
+
+
+def test_tracked_keys_are_capped():
+    limiter = InProcessRateLimiter(max_keys=2)
+
+    async def attempts():
+        for n in range(5):
+            await limiter.consume(f"login:client:{n}", BUCKET)
+
+    asyncio.run(attempts())
+    assert len(limiter._buckets) <= 2
@@ -0,0 +1,30 @@
+import asyncio
+
+from app.services.session_store import session_store
+
+
+def test_tokens_resolve_until_revoked():
+    token = session_store.create("jane.doe@example.com")
+    assert session_store.resolve(token) == "jane.doe@example.com"
+
+    session_store.revoke(token)
+    assert session_store.resolve(token) is None
+    assert session_store.resolve("") is None
+
+
+def test_revoke_user_ends_every_session_of_that_user():
+    tokens = [session_store.create("jane.doe@example.com") for _ in range(2)]
+    other = session_store.create("admin@example.com")
+
+    session_store.revoke_user("jane.doe@example.com")
+
+    assert [session_store.resolve(token) for token in tokens] == [None, None]
+    assert session_store.resolve(other) == "admin@example.com"
+
+
+def test_sweep_drops_expired_sessions():
+    session_store.set_lifetime_hours(0)
+    token = session_store.create("jane.doe@example.com")
+
+    assert asyncio.run(session_store.sweep()) == 1
+    assert session_store.resolve(token) is None
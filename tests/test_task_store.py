@@ -0,0 +1,149 @@
+from app.services.task_store import task_store
+
+
+def new_task(**fields) -> dict:
+    return task_store.create_task(
+        {
+            "title": "Untitled",
+            "description": "",
+            "assignee": "admin@example.com",
+            "due_date": "2024-09-30",
+            "priority": "Low",
+            "tags": [],
+            "status": "To Do",
+            **fields,
+        }
+    )
+
+
+def ids(tasks: list[dict]) -> list[int]:
+    return [task["id"] for task in tasks]
+
+
+def test_load_columns_counts_the_whole_column_but_windows_it():
+    for n in range(4):
+        new_task(title=f"Backlog item {n}")
+
+    counts, windows = task_store.load_columns({"To Do": 3, "Done": 1})
+
+    assert counts == {"To Do": 6, "In Progress": 2, "Done": 1}
+    assert ids(windows["To Do"]) == [4, 5, 6]
+    assert ids(windows["Done"]) == [3]
+    assert "In Progress" not in windows
+    assert ids(task_store.list_task_summaries("To Do", after_id=6, limit=3)) == [
+        7,
+        8,
+        9,
+    ]
+
+
+def test_load_columns_filters_by_assignee_tag_and_search():
+    counts, windows = task_store.load_columns(
+        {"In Progress": 25}, assignee="jane.doe@example.com", tag="Security"
+    )
+    assert counts == {"In Progress": 1}
+    assert ids(windows["In Progress"]) == [2]
+    assert windows["In Progress"][0]["tags"] == ["Backend", "Security"]
+
+    counts, _ = task_store.load_columns({}, query="landing")
+    assert counts == {"In Progress": 1}
+
+
+def test_search_follows_comments_and_deletes():
+    task_store.add_comment(4, "admin@example.com", "needs a glossary")
+    counts, windows = task_store.load_columns({"To Do": 25}, query="gloss")
+    assert ids(windows["To Do"]) == [4]
+
+    task_store.delete_task(4)
+    assert task_store.load_columns({"To Do": 25}, query="gloss") == ({}, {"To Do": []})
+
+
+def test_set_status_reports_the_previous_status():
+    assert task_store.set_status(4, "Done") == "To Do"
+    assert task_store.set_status(4, "Done") == "Done"
+    assert task_store.get_task(4)["status"] == "Done"
+    assert task_store.set_status(999, "Done") is None
+
+
+def test_tags_and_open_tasks_due():
+    new_task(tags=["Zeta"], due_date="2024-10-01")
+    new_task(tags=["Zeta"], due_date="2024-10-01", status="Done")
+
+    assert task_store.list_tags()[-1] == "Zeta"
+    assert task_store.count_open_due("2024-10-01") == 1
+
+
+def test_history_pages_newest_first():
+    for n in range(5):
+        task_store.append_history(4, "admin@example.com", f"step {n}")
+
+    first = task_store.list_history(4, limit=3)
+    last = first[-1]
+    rest = task_store.list_history(4, before=(last["timestamp"], last["id"]), limit=10)
+
+    assert [log["action"] for log in first] == ["step 4", "step 3", "step 2"]
+    assert [log["action"] for log in rest][:2] == ["step 1", "step 0"]
+
+
+def test_duplicate_copies_tags_and_comments():
+    copy = task_store.duplicate_task(1, "Design new landing page (Copy)")
+
+    original = task_store.get_task(1)
+    assert copy["tags"] == original["tags"]
+    assert len(copy["comments"]) == len(original["comments"])
+    assert task_store.duplicate_task(999, "missing") is None
+
+
+def test_search_archive_uses_the_archive_index():
+    task = new_task(
+        title="Migrate billing exports",
+        description="Move the nightly CSV job to the warehouse.",
+        tags=["Finance"],
+        status="Done",
+    )
+    assert task["id"] in task_store.archive_done_tasks(older_than_days=-1)
+
+    assert [t["id"] for t in task_store.search_archive("warehou")] == [task["id"]]
+    assert [t["id"] for t in task_store.search_archive("finance")] == [task["id"]]
+    assert task_store.search_archive("landing") == []
+    assert task_store.is_archived(task["id"])
+
+    task_store.restore_task(task["id"])
+    assert task_store.search_archive("warehouse") == []
+    assert not task_store.is_archived(task["id"])
+
+
+def test_writes_to_a_missing_task_return_none():
+    task_store.delete_task(4)
+
+    assert task_store.update_task(4, {"title": "x", "tags": ["y"]}) is None
+    assert task_store.add_comment(4, "admin@example.com", "hello") is None
+
+
+def test_status_and_tag_totals_follow_every_write():
+    def grouped():
+        with task_store.pool.connection() as conn:
+            statuses = conn.execute(
+                "SELECT status, count(*) FROM tasks GROUP BY status"
+            ).fetchall()
+            tags = conn.execute(
+                "SELECT DISTINCT tag FROM task_tags ORDER BY tag"
+            ).fetchall()
+        return dict(map(tuple, statuses)), [tag for (tag,) in tags]
+
+    task = new_task(tags=["Zeta", "Alpha"])
+    task_store.update_task(task["id"], {"tags": ["Zeta"]})
+    task_store.set_status(task["id"], "Done")
+    task_store.duplicate_task(1, "copy")
+    task_store.delete_task(2)
+    task_store.archive_done_tasks(older_than_days=-1)
+
+    counts, _ = task_store.load_columns({})
+    assert (counts, task_store.list_tags()) == grouped()
+    assert "Alpha" not in task_store.list_tags()
+    assert "Zeta" not in task_store.list_tags()
+
+    task_store.restore_task(task["id"])
+    counts, _ = task_store.load_columns({})
+    assert (counts, task_store.list_tags()) == grouped()
+    assert "Zeta" in task_store.list_tags()
@@ -0,0 +1,37 @@
+import asyncio
+
+from app.services.user_directory import user_directory
+
+
+def _page(query="", department=None, sort="name", descending=False, page=0):
+    return user_directory.index().page(
+        query, department, sort, descending, set(), page, 2 if page else 25
+    )
+
+
+def test_index_is_shared_until_a_write():
+    index = user_directory.index()
+    assert user_directory.index() is index
+
+    asyncio.run(
+        user_directory.store.create_user(
+            {
+                "full_name": "José Álvarez",
+                "email": "jose@example.com",
+                "department": "Sales",
+                "password": "Password123!",
+            }
+        )
+    )
+
+    assert user_directory.index() is not index
+    assert _page("jose") == (1, 0, ["jose@example.com"])
+    assert "Sales" in user_directory.index().departments
+
+
+def test_page_filters_sorts_and_clamps():
+    total, page, emails = _page(descending=True, page=5)
+    assert (total, page) == (3, 1)
+    assert emails == ["admin@example.com"]
+    assert _page(department="Marketing") == (1, 0, ["john.smith@example.com"])
+    assert _page("do") == (1, 0, ["jane.doe@example.com"])
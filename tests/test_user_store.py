@@ -0,0 +1,62 @@
+import asyncio
+
+from app.services.passwords import is_hashed
+from app.services.user_store import UserStore, user_store
+
+NEW_USER = {
+    "full_name": "Ana Lima",
+    "email": "ana.lima@example.com",
+    "department": "Sales",
+    "password": "Password123!",
+}
+
+
+def test_passwords_are_hashed_and_checked():
+    assert asyncio.run(user_store.create_user(NEW_USER))
+    assert not asyncio.run(user_store.create_user(NEW_USER))
+
+    with user_store.pool.connection() as conn:
+        (stored,) = conn.execute(
+            "SELECT password FROM users WHERE email = ?", (NEW_USER["email"],)
+        ).fetchone()
+    assert stored != NEW_USER["password"]
+    profile = asyncio.run(user_store.check_password(NEW_USER["email"], "Password123!"))
+    assert profile["full_name"] == "Ana Lima"
+    assert "password" not in profile
+    assert asyncio.run(user_store.check_password(NEW_USER["email"], "nope")) is None
+
+
+def test_profile_writes_notify_listeners():
+    changes = []
+    store = UserStore(user_store.pool)
+    store.on_change(lambda: changes.append(1))
+
+    asyncio.run(store.create_user(NEW_USER))
+    asyncio.run(store.update_user(NEW_USER["email"], {"password": "Password456!"}))
+    assert len(changes) == 1
+
+    profile = asyncio.run(store.update_user(NEW_USER["email"], {"role": "Admin"}))
+    assert profile["role"] == "Admin"
+    assert store.delete_user(NEW_USER["email"])
+    assert not store.delete_user(NEW_USER["email"])
+    assert len(changes) == 3
+    assert store.get_profile(NEW_USER["email"]) is None
+
+
+def test_plain_text_passwords_are_migrated_in_batches():
+    with user_store.pool.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO users (email, full_name, department, password)"
+            " VALUES (?, ?, ?, ?)",
+            [(f"legacy{n}@example.com", "Legacy", "Sales", f"pw{n}") for n in range(5)],
+        )
+
+    assert asyncio.run(user_store.migrate_plaintext_passwords(batch_size=2)) == 2
+    assert asyncio.run(user_store.migrate_plaintext_passwords(batch_size=2)) == 2
+    assert asyncio.run(user_store.migrate_plaintext_passwords(batch_size=2)) == 1
+    assert asyncio.run(user_store.migrate_plaintext_passwords(batch_size=2)) == 0
+
+    with user_store.pool.connection() as conn:
+        stored = [row["password"] for row in conn.execute("SELECT password FROM users")]
+    assert all(is_hashed(password) for password in stored)
+    assert asyncio.run(user_store.check_password("legacy3@example.com", "pw3"))
@@ -0,0 +1,25 @@
+from app.services.var_profiling import profile_computed_vars, var_profiler
+from app.states.auth_state import AuthState
+
+
+def test_recompute_is_counted(session):
+    computed_var = vars(AuthState)["user_page_count"]
+    original = computed_var._fget
+    var_profiler.reset()
+    profile_computed_vars(AuthState)
+    try:
+        auth = session.state(AuthState)
+        auth.user_total = 60
+        assert auth.user_page_count == 3
+    finally:
+        # ComputedVar is a frozen dataclass.
+        object.__setattr__(computed_var, "_fget", original)
+
+    (row,) = [
+        row
+        for row in var_profiler.snapshot()
+        if row["var"] == "AuthState.user_page_count"
+    ]
+    assert row["recomputes"] >= 1
+    assert row["last_output_bytes"] == 1
+    var_profiler.reset()